@@ -5,17 +5,15 @@ import os
 import re
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 # ── 3rd-party
-import urwid
 from dotenv import load_dotenv
-from openai import OpenAI
 from prompt_toolkit import PromptSession
 from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.completion import PathCompleter, WordCompleter, FuzzyCompleter
+from prompt_toolkit.completion import WordCompleter, FuzzyCompleter
 from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.keys import Keys
 from prompt_toolkit.filters import Condition
@@ -36,10 +34,17 @@ from src.gptcli.services.tool_loop import ToolLoopService
 from src.gptcli.services.summarization import SummarizationService
 from src.gptcli.tools.permission import TrustLevel
 from src.gptcli.tools.schemas import estimate_tool_schemas_tokens
-from src.gptcli.ui.completion import PathCompleterWrapper, ConditionalCompleter
+from src.gptcli.ui.completion import CachedPathCompleter, PathCompleterWrapper, ConditionalCompleter
+from src.gptcli.ui.history import BufferedFileHistory
 from src.gptcli.utils.common import Utils
 from src.gptcli.commands.handler import CommandHandler
 
+if TYPE_CHECKING:
+    import urwid
+
+# 응답 마크다운 파일명에 쓸 수 없는 문자 (세션명 → 안전한 파일명 접두사)
+_UNSAFE_FILENAME_RE = re.compile(r'[^a-zA-Z0-9_-]')
+
 class GPTCLI:
     """
     GPT-CLI 애플리케이션의 메인 클래스.
@@ -51,23 +56,25 @@ class GPTCLI:
     
     def __init__(self, session_name: str, mode: str = "dev"):
         # --- 핵심 컴포넌트 초기화 (의존성 주입) ---
-        self.config = ConfigManager()
         self.theme_manager = ThemeManager(default_theme='monokai-ish')
         self.console = Console(theme=self.theme_manager.get_rich_theme())
+        self.config = ConfigManager(console=self.console)
         self._next_prompt_default: Optional[str] = None
         self._pasted_text_counter: int = 0  # 긴 텍스트 붙여넣기 카운터
+        # (세션명, 파일명용으로 치환한 세션명). 세션이 바뀔 때만 다시 계산
+        self._safe_session_name: Optional[Tuple[str, str]] = None
         self._pasted_content: Optional[str] = None  # 압축 표시된 원본 텍스트 저장
         
-        self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=os.getenv("OPENROUTER_API_KEY"),
-            default_headers={
+        client_options = {
+            "base_url": "https://openrouter.ai/api/v1",
+            "api_key": os.getenv("OPENROUTER_API_KEY"),
+            "default_headers": {
                 "HTTP-Referer": os.getenv("APP_URL", "https://github.com/user/gpt-cli"),
                 "X-Title": os.getenv("APP_TITLE", "GPT-CLI"),
-            }
-        )
-        
-        self.parser = AIStreamParser(self.client, self.console)
+            },
+        }
+        # OpenAI 클라이언트는 첫 API 요청 시 생성됩니다 (openai 임포트 비용을 시작 시간에서 제외).
+        self.parser = AIStreamParser(self.console, client_options=client_options)
         self.token_estimator = TokenEstimator(console=self.console)
         self.sessions = SessionService(self.config, self.console)
         self.command_handler = CommandHandler(self, self.config, self.sessions)
@@ -112,6 +119,7 @@ class GPTCLI:
         # --- 애플리케이션 모드 플래그 ---
         self.compact_mode: bool = True
         self.pretty_print_enabled: bool = True
+        self.response_cache_enabled: bool = False
         
         # --- Prompt Toolkit 세션 설정 ---
         self.prompt_session = self._setup_prompt_session()
@@ -133,16 +141,15 @@ class GPTCLI:
         h = self.command_handler
 
         def reg(name: str, fn):
-            # 주의: late-binding 방지 위해 기본 인자에 fn 바인딩
-            self.router.register(
-                SimpleCallbackCommand(name, lambda args, _fn=fn: _fn(args))
-            )
+            # 바운드 메서드를 그대로 콜백으로 등록 (디스패치마다 람다 호출 한 단계 절약)
+            self.router.register(SimpleCallbackCommand(name, fn))
 
         # 종료
         reg("exit", h.handle_exit)
 
         # 모드/테마/출력
         reg("compact_mode", h.handle_compact_mode)
+        reg("cache", h.handle_cache)
         reg("pretty_print", h.handle_pretty_print)
         reg("mode", h.handle_mode)
         reg("theme", h.handle_theme)
@@ -190,13 +197,10 @@ class GPTCLI:
         command_list = [cmd.split()[0] for cmd in constants.COMMANDS.strip().split('\n')]
         command_completer = FuzzyCompleter(WordCompleter(command_list, ignore_case=True))
 
-        path_completer = PathCompleter(
-            file_filter=lambda filename: not self.config.is_ignored(Path(filename), self.config.get_ignore_spec()),
-            expanduser=True
-        )
+        # 디렉터리 목록을 캐시하고 .gptignore 필터(디렉터리 후보 포함)를 미리 적용한 경로 완성기
+        path_completer = CachedPathCompleter(self.config, expanduser=True)
         #wrapped_file_completer = PathCompleterWrapper("/files ", path_completer)
-        # 디렉터리 후보까지 .gptignore 필터를 적용하려면 래퍼에서 후처리 필터링 필요
-        wrapped_file_completer = PathCompleterWrapper("/files ", path_completer, self.config)
+        wrapped_file_completer = PathCompleterWrapper("/files ", path_completer, self.config, prefiltered=True)
         self.completer = ConditionalCompleter(command_completer, wrapped_file_completer)
         self.completer.config = self.config
         self.completer.theme_manager = self.theme_manager
@@ -324,8 +328,9 @@ class GPTCLI:
                 gptcli_instance._pasted_content = None
                 event.current_buffer.insert_text(data)
 
+        self.prompt_history = BufferedFileHistory(self.config.PROMPT_HISTORY_FILE)
         return PromptSession(
-            history=FileHistory(self.config.PROMPT_HISTORY_FILE),
+            history=self.prompt_history,
             #auto_suggest=AutoSuggestFromHistory(),
             auto_suggest=SafeAutoSuggest(),
             multiline=True,
@@ -387,13 +392,31 @@ class GPTCLI:
         if not self.attached:
             return {"role": "user", "content": user_input}
 
-        content_parts = [{"type": "text", "text": user_input}]
-        for file_path_str in self.attached:
+        # 여러 파일을 한 요청에 담을 때는 파일별 토큰 계산/출력 대신 한 줄 요약만 표시
+        # (파일별 토큰은 첨부 시점의 토큰 분석 표에서 이미 보여줌)
+        multi = len(self.attached) > 1
+
+        def load_part(file_path_str: str) -> Optional[Dict[str, Any]]:
             path = Path(file_path_str)
-            if path.exists():
-                part = Utils.prepare_content_part(path, self.console, self.token_estimator)
-                if part:
-                    content_parts.append(part)
+            if not path.exists():
+                return None
+            return Utils.prepare_content_part(
+                path, self.console, self.token_estimator, report_text_tokens=not multi
+            )
+
+        # 파일 읽기/인코딩은 서로 독립적인 I/O 위주 작업이므로 여러 개면 스레드로 동시에 처리
+        # (map은 입력 순서를 유지하므로 첨부 순서는 그대로)
+        if multi:
+            with ThreadPoolExecutor(max_workers=min(8, len(self.attached))) as ex:
+                parts = list(ex.map(load_part, self.attached))
+        else:
+            parts = [load_part(self.attached[0])]
+
+        content_parts = [{"type": "text", "text": user_input}]
+        content_parts.extend(part for part in parts if part)
+
+        if multi:
+            self.console.print(f"[dim]📎 첨부 {len(content_parts) - 1}개 파일을 한 요청으로 전송[/dim]", highlight=False)
         
         return {"role": "user", "content": content_parts}
 
@@ -478,8 +501,25 @@ class GPTCLI:
         # 3. API 호출 및 응답 스트리밍 (Tool Loop 사용)
         system_prompt = {"role": "system", "content": system_prompt_content}
 
+        # 응답 캐시 (Tool 모드는 파일/명령 실행 부작용이 있으므로 제외)
+        cache_key = None
+        cached = None
+        if self.response_cache_enabled and not self.tool_mode_enabled:
+            cache_key = Utils.build_response_cache_key(self.model, system_prompt_content, final_messages)
+            cached = self.config.load_cached_response(cache_key)
+
+        if cached:
+            self.console.print(
+                f"[dim]💾 캐시된 응답 사용 ({cached.get('saved_at', '?')}) – API 호출 생략[/dim]", highlight=False
+            )
+            if self.pretty_print_enabled:
+                from rich.markdown import Markdown
+                self.console.print(Markdown(cached["reply"]), highlight=False)
+            else:
+                self.console.print(cached["reply"], markup=False, highlight=False)
+            result = (cached["reply"], None)
         # Tool 모드가 활성화된 경우 Tool Loop 사용
-        if self.tool_mode_enabled:
+        elif self.tool_mode_enabled:
             result = self.tool_loop.run_with_tools(
                 system_prompt, final_messages, self.model, self.pretty_print_enabled
             )
@@ -503,18 +543,36 @@ class GPTCLI:
         # Tool 실행 중간 메시지(tool_calls, tool results)는 세션에 저장하지 않음
         # 이는 Anthropic API의 tool_use/tool_result 페어링 요구사항 때문
         self.last_response, usage_info = result
+        if cache_key and not cached and self.last_response:
+            self.config.save_cached_response(cache_key, self.last_response, self.model)
 
+        # 응답당 코드 블록 추출은 여기서 한 번만 수행하고,
+        # 아래 save_code_blocks와 /copy(handle_copy)가 이 결과를 그대로 재사용합니다.
         self.last_reply_code_blocks = Utils.extract_code_blocks(self.last_response)
 
         # 최종 텍스트 응답만 저장 (tool_calls 없는 순수 텍스트)
-        self.messages.append({"role": "assistant", "content": self.last_response})
+        assistant_message = {"role": "assistant", "content": self.last_response}
+        self.messages.append(assistant_message)
         
         if usage_info:
             self.usage_history.append(usage_info)
 
-        self.config.save_session(
-            self.current_session_name, self.messages, self.model, self.model_context, self.usage_history, mode=self.mode,
-        )
+        # 요약으로 메시지 목록이 바뀐 턴은 전체 저장, 그 외에는 이번 턴만 JSONL에 추가
+        journal_size = 0
+        if not was_summarized:
+            journal_size = self.config.append_session_turn(
+                self.current_session_name,
+                [user_message, assistant_message],
+                base_count=len(self.messages) - 2,
+                usage=usage_info,
+                model=self.model,
+                context_length=self.model_context,
+                mode=self.mode,
+            )
+        if was_summarized or journal_size >= constants.SESSION_JOURNAL_COMPACT_TURNS:
+            self.config.save_session(
+                self.current_session_name, self.messages, self.model, self.model_context, self.usage_history, mode=self.mode,
+            )
 
         # 5. 후처리 (코드 블록 저장 등)
         if self.last_reply_code_blocks:
@@ -533,11 +591,15 @@ class GPTCLI:
 
         
         timestamp = time.strftime("%Y%m%d_%H%M%S")
-        safe_session_name = re.sub(r'[^a-zA-Z0-9_-]', '_', self.current_session_name)
+        if self._safe_session_name is None or self._safe_session_name[0] != self.current_session_name:
+            self._safe_session_name = (
+                self.current_session_name, _UNSAFE_FILENAME_RE.sub('_', self.current_session_name)
+            )
+        safe_session_name = self._safe_session_name[1]
         md_filename = f"{safe_session_name}_{timestamp}_{len(self.messages)//2}.md"
         saved_path = self.config.MD_OUTPUT_DIR.joinpath(md_filename)
         try:
-            saved_path.write_text(self.last_response, encoding="utf-8")
+            self.config.save_response_markdown(saved_path, self.last_response)
             display_path_str = str(saved_path.relative_to(self.config.BASE_DIR))
             self.console.print(Panel.fit(
                     Text(display_path_str),
@@ -554,7 +616,7 @@ class GPTCLI:
     def run(self):
         """애플리케이션의 메인 실행 루프."""
         self._load_initial_session()
-        self.console.print(Panel.fit(constants.COMMANDS, title="[yellow]/명령어[/yellow]"))
+        self.command_handler.handle_commands([])
         self.console.print(f"[cyan]세션('{self.current_session_name}') 시작 – 모델: {self.model}[/cyan]")
 
         # Tool 모드 안내
@@ -622,7 +684,10 @@ class GPTCLI:
 
             except (KeyboardInterrupt, EOFError):
                 break
-        
+
+        # 프롬프트 히스토리 flush
+        self.prompt_history.close()
+
         # 종료 전 마지막 세션 저장
         self.config.save_session(
             self.current_session_name,
@@ -639,6 +704,9 @@ class GPTCLI:
         except Exception:
             pass
 
+        # 백그라운드에 남은 쓰기(응답 캐시 등) 마무리
+        self.config.flush_writes()
+
         self.console.print("\n[bold cyan]세션이 저장되었습니다. 안녕히 가세요![/bold cyan]")
 
 def main() -> None:
@@ -1,5 +1,5 @@
 # src/constants.py
-from typing import Dict, List, Set
+from typing import Dict, FrozenSet, List
 
 # --- Application Core Settings ---
 DEFAULT_MODEL: str = "anthropic/claude-opus-4.5"
@@ -13,6 +13,11 @@ SUMMARIZATION_THRESHOLD: float = 0.80       # 80% 사용 시 자동 요약 트
 MIN_MESSAGES_TO_SUMMARIZE: int = 6          # 최소 요약 대상 메시지 수
 KEEP_RECENT_MESSAGES: int = 4               # 요약에서 제외할 최근 메시지 수
 MAX_SUMMARY_LEVELS: int = 3                 # 최대 재요약 횟수
+SUMMARY_MAX_PARALLEL_REQUESTS: int = 4      # 청크 분할 요약 시 동시에 보낼 최대 요청 수
+
+# --- Session Persistence ---
+SESSION_JOURNAL_COMPACT_TURNS: int = 20     # 턴 로그(JSONL)가 이만큼 쌓이면 전체 세션 JSON으로 합침
+RESPONSE_CACHE_MAX_AGE: int = 7 * 24 * 3600  # 응답 캐시 유효 기간(초), 지나면 캐시 미스로 처리
 
 API_URL: str = "https://openrouter.ai/api/v1/models"
 
@@ -42,20 +47,24 @@ COMMANDS: str = """
 /toolforce                      → Tool 강제 모드 토글 (항상 Tool 사용)
 /summarize [--force]            → 컨텍스트 수동 요약 (오래된 대화 압축)
 /show_summary                   → 현재 요약 정보 표시
+/cache                          → 응답 캐시 ON/OFF 토글 (동일 질문은 API 호출 생략)
 /exit                           → 종료
 """.strip()
 
-PLAIN_EXTS: Set[str] = {
+PLAIN_EXTS: FrozenSet[str] = frozenset({
     ".txt", ".md", ".py", ".js", ".ts", ".tsx", ".jsx", ".java",
     ".c", ".cpp", ".json", ".yml", ".yaml", ".html", ".css", ".scss",
     ".rs", ".go", ".php", ".rb", ".sh", ".sql",
-}
-IMG_EXTS: Set[str] = {".png", ".jpg", ".jpeg", ".webp", ".gif", ".bmp"}
+})
+IMG_EXTS: FrozenSet[str] = frozenset({".png", ".jpg", ".jpeg", ".webp", ".gif", ".bmp"})
 PDF_EXT: str = ".pdf"
+# 첨부 가능한 전체 확장자 (확장자 필터가 필요할 때 매번 튜플을 만들지 않고 이 집합으로 조회)
+ALLOWED_EXTS: FrozenSet[str] = PLAIN_EXTS | IMG_EXTS | {PDF_EXT}
 
 # --- UI & Theme Data ---
 REASONING_PANEL_HEIGHT: int = 10
 CODE_PREVIEW_PANEL_HEIGHT: int = 15
+STREAM_FLUSH_INTERVAL: float = 0.5          # 스트리밍 중 문단 경계가 없을 때 완성된 줄을 출력하는 최대 간격(초)
 
 # [이동] ThemeManager의 데이터
 THEME_DATA: Dict[str, Dict[str, str]] = {
@@ -5,18 +5,14 @@ from __future__ import annotations
 # ── stdlib
 import argparse
 import base64
-import json
 import os
 import subprocess
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
 
 # ── 3rd-party
-import urwid
-import pyperclip
 from rich.panel import Panel
-from rich.markdown import Markdown
 from rich.table import Table
 from rich.box import ROUNDED
 
@@ -24,10 +20,17 @@ from rich.box import ROUNDED
 import src.constants as constants
 from src.gptcli.services.config import ConfigManager
 from src.gptcli.services.sessions import SessionService
-from src.gptcli.ui.file_selector import FileSelector
-from src.gptcli.ui.diff_view import CodeDiffer
 from src.gptcli.utils.common import Utils
-from src.gptcli.models.model_searcher import ModelSearcher
+
+if TYPE_CHECKING:
+    # urwid 기반 TUI 모듈은 해당 명령을 처음 실행할 때 불러옵니다 (시작 시간 절약).
+    from src.gptcli.ui.diff_view import CodeDiffer
+
+# /mode 인자 파서는 호출마다 만들지 않고 한 번만 생성 (기본값은 현재 모드이므로 호출 시 채움)
+_MODE_PARSER = argparse.ArgumentParser(prog="/mode", add_help=False)
+_MODE_PARSER.add_argument("mode_name", nargs='?', choices=constants.SUPPORTED_MODES, default=None)
+# 명령어 목록 패널 (내용이 고정이므로 시작 안내와 /commands에서 같은 객체를 재사용)
+_COMMANDS_PANEL = Panel.fit(constants.COMMANDS, title="[yellow]/명령어[/yellow]")
 
 class CommandHandler:
     """
@@ -91,34 +94,54 @@ class CommandHandler:
         status = "[green]활성화[/green]" if self.app.pretty_print_enabled else "[yellow]비활성화[/yellow]"
         self.console.print(f"고급 출력(Rich) 모드가 {status} 되었습니다.", highlight=False)
 
+    def handle_cache(self, args: List[str]) -> None:
+        """응답 캐시를 토글합니다. (Tool 모드에서는 사용되지 않음)"""
+        self.app.response_cache_enabled = not self.app.response_cache_enabled
+        status = "[green]활성화[/green]" if self.app.response_cache_enabled else "[yellow]비활성화[/yellow]"
+        self.console.print(f"응답 캐시가 {status}되었습니다.", highlight=False)
+        self.console.print(
+            f"[dim]활성화 시: 같은 모델·모드·대화로 다시 질문하면 API 호출 없이 "
+            f"{self.config.RESPONSE_CACHE_DIR.name}/ 에 저장된 응답을 사용합니다. (Tool 모드 제외)[/dim]",
+            highlight=False
+        )
+
     def handle_mode(self, args: List[str]) -> None:
         """
         시스템 프롬프트 모드만 변경합니다.
         - 세션 전환/백업/복원은 수행하지 않습니다.
         """
-        parser = argparse.ArgumentParser(prog="/mode", add_help=False)
-        parser.add_argument("mode_name", nargs='?', choices=constants.SUPPORTED_MODES, default=self.app.mode)
-        
         try:
-            parsed_args = parser.parse_args(args)
+            parsed_args = _MODE_PARSER.parse_args(args)
         except SystemExit:
             self.console.print("[red]인자 오류. 사용법: /mode [<모드>][/red]", highlight=False)
             return
 
         old_mode = self.app.mode
-        self.app.mode = parsed_args.mode_name
+        self.app.mode = parsed_args.mode_name or old_mode
         self.console.print(f"[green]모드 변경: {old_mode} → {self.app.mode}[/green]", highlight=False)
 
-        # 변경 즉시 세션에 반영
+        # 변경 즉시 세션에 반영 (전체 JSON을 다시 쓰지 않고 메시지 없는 턴 로그로 모드만 추가)
         try:
-            self.config.save_session(
-                getattr(self.app, "current_session_name", "default"),
-                getattr(self.app, "messages", []),
-                getattr(self.app, "model", ""),
-                getattr(self.app, "model_context", 0),
-                getattr(self.app, "usage_history", []),
+            sess = getattr(self.app, "current_session_name", "default")
+            messages = getattr(self.app, "messages", [])
+            journal_size = self.config.append_session_turn(
+                sess,
+                [],
+                base_count=len(messages),
+                usage=None,
+                model=getattr(self.app, "model", ""),
+                context_length=getattr(self.app, "model_context", 0),
                 mode=self.app.mode,
             )
+            if journal_size >= constants.SESSION_JOURNAL_COMPACT_TURNS:
+                self.config.save_session(
+                    sess,
+                    messages,
+                    getattr(self.app, "model", ""),
+                    getattr(self.app, "model_context", 0),
+                    getattr(self.app, "usage_history", []),
+                    mode=self.app.mode,
+                )
         except Exception:
             pass
 
@@ -128,7 +151,6 @@ class CommandHandler:
         사용자 선택 결과의 '세션명'을 반환합니다. 취소 시 None.
         """
         import urwid
-
         current = getattr(self.app, "current_session_name", None)
         # 통합 목록(현재 제외, 중복 제거)
         names = self.config.get_session_names(include_backups=True, exclude_current=current)
@@ -162,7 +184,7 @@ class CommandHandler:
             name = p.stem.replace("session_", "")
             label = name
             try:
-                data = json.loads(p.read_text(encoding="utf-8", errors="ignore"))
+                data = Utils._json_loads(p.read_bytes())
                 meta = data.get("backup_meta", {}) or {}
                 name = str(meta.get("session") or data.get("name") or name).strip() or name
                 msg_count = meta.get("message_count", len(data.get("messages", [])))
@@ -333,6 +355,7 @@ class CommandHandler:
             self.console.print("[green]BACKUP OK (단일 스냅샷 갱신)[/green]", highlight=False)
 
     def _select_model(self, current_model: str, current_context: int) -> Tuple[str, int]:
+        import urwid
         model_file = self.config.MODELS_FILE
         default_context = self.app.default_context_length
         palette = self.theme_manager.get_urwid_palette()
@@ -447,6 +470,7 @@ class CommandHandler:
 
     def handle_search_models(self, args: List[str]) -> None:
         """키워드로 모델을 검색하고 `ai_models.txt`를 업데이트합니다."""
+        from src.gptcli.models.model_searcher import ModelSearcher
         searcher = ModelSearcher(
             config = self.config,
             theme_manager = self.theme_manager,
@@ -533,6 +557,7 @@ class CommandHandler:
 
     def handle_last_response(self, args: List[str]) -> None:
         """마지막 응답을 Rich Markdown 형식으로 다시 출력합니다."""
+        from rich.markdown import Markdown
         last_msg = self._get_last_assistant_message()
         if last_msg:
             self.console.print(Panel(Markdown(last_msg), title="[yellow]Last Response[/yellow]", border_style="dim"), highlight=False)
@@ -558,6 +583,8 @@ class CommandHandler:
         if not self.app.last_reply_code_blocks:
             self.console.print("[yellow]복사할 코드 블록이 없습니다.[/yellow]", highlight=False)
             return
+        # 클립보드 백엔드 로드는 /copy를 실제로 쓸 때만 (시작 시간 절약)
+        import pyperclip
         try:
             index = int(args[0]) - 1 if args else 0
             if 0 <= index < len(self.app.last_reply_code_blocks):
@@ -601,10 +628,11 @@ class CommandHandler:
                 size_str = f"{file_size / (1024 * 1024):.1f} MB"
             
             # 파일 타입 판별
-            if path.suffix.lower() in constants.IMG_EXTS:
+            ext = path.suffix.lower()
+            if ext in constants.IMG_EXTS:
                 file_type = "🖼️ 이미지"
                 tokens = self.app.token_estimator.estimate_image_tokens(path)
-            elif path.suffix.lower() == constants.PDF_EXT:
+            elif ext == constants.PDF_EXT:
                 file_type = "📄 PDF"
                 tokens = self.app.token_estimator.estimate_pdf_tokens(path)
             else:
@@ -644,6 +672,7 @@ class CommandHandler:
 
     def handle_all_files(self, args: List[str]) -> None:
         """TUI 파일 선택기를 엽니다."""
+        from src.gptcli.ui.file_selector import FileSelector
         selector = FileSelector(config=self.config, theme_manager=self.theme_manager)
         self.app.attached = selector.start()
         if self.app.attached:
@@ -670,6 +699,7 @@ class CommandHandler:
                 # FileSelector 내의 get_all_files_in_dir는 is_ignored를 호출해야 하므로,
                 # FileSelector 생성 시 config를 넘겨주는 방식으로 수정이 필요할 수 있음.
                 # 여기서는 FileSelector가 config를 알아서 쓴다고 가정.
+                from src.gptcli.ui.file_selector import FileSelector
                 temp_selector = FileSelector(config=self.config, theme_manager=self.theme_manager)
                 added_paths.update(temp_selector.get_all_files_in_dir(p_resolved))
 
@@ -685,6 +715,7 @@ class CommandHandler:
         
     def handle_diff_code(self, args: List[str]) -> None:
         """코드 블록 비교 TUI를 엽니다."""
+        from src.gptcli.ui.diff_view import CodeDiffer
         differ = CodeDiffer(
             attached_files=self.app.attached,
             session_name=self.app.current_session_name,
@@ -799,7 +830,7 @@ class CommandHandler:
         
     def handle_commands(self, args: List[str]) -> None:
         """사용 가능한 모든 명령어 목록을 표시합니다."""
-        self.console.print(Panel.fit(constants.COMMANDS, title="[yellow]/명령어[/yellow]"), highlight=False)
+        self.console.print(_COMMANDS_PANEL, highlight=False)
     
     def _build_context_report(
         self,
@@ -832,7 +863,8 @@ class CommandHandler:
         available_for_prompt = max(0, model_context_limit - sys_tokens - reserve_for_completion - vendor_offset)
         prompt_budget = int(available_for_prompt * trim_ratio)
 
-        # 전체 메시지 토큰 합계(추정)
+        # 전체 메시지 토큰 합계(추정). 아래 세부 집계에서도 같은 텍스트를 다시 세므로 먼저 일괄 토큰화
+        te.warm_token_cache(Utils._iter_message_texts(messages_to_send))
         per_msg: List[Tuple[int, Dict[str, Any], int]] = [
             (i, m, Utils._count_message_tokens_with_estimator(m, te))
             for i, m in enumerate(messages_to_send)
@@ -995,7 +1027,7 @@ class CommandHandler:
             reserve_for_completion = 4_096
 
         # 3) 시스템 프롬프트
-        system_prompt = Utils.get_system_prompt_content(self.app.mode).strip()
+        system_prompt = Utils.get_system_prompt_content(self.app.mode)
 
         # 4) 전송 대상 메시지 준비(Compact 모드 반영)
         messages_for_estimation = self.app.get_messages_for_sending()
@@ -1135,7 +1167,6 @@ class CommandHandler:
             return
 
         # 현재 상태 표시
-        from src.gptcli.utils.common import Utils
         system_prompt = Utils.get_system_prompt_content(self.app.mode)
         system_tokens = self.app.token_estimator.count_text_tokens(system_prompt)
 
@@ -1184,8 +1215,6 @@ class CommandHandler:
         """
         현재 세션의 요약 정보를 표시합니다.
         """
-        from rich.table import Table
-
         summary_info = self.app.summarization_service.get_summary_info(self.app.messages)
 
         if not summary_info:
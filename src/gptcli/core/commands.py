@@ -1,8 +1,11 @@
 # src/gptcli/core/commands.py
 from __future__ import annotations
-import shlex
+import re, shlex
 from typing import Callable, Dict, List, Optional, Protocol
 
+# 명령 이름 토큰: shlex.split과 같은 공백 집합(' \t\r\n')으로만 자름 (str.split은 \x0b, \x0c, 유니코드 공백도 자름)
+_COMMAND_NAME_RE = re.compile(r"[ \t\r\n]*([^ \t\r\n]+)")
+
 class Command(Protocol):
     """
     개별 명령 객체 인터페이스.
@@ -68,7 +71,8 @@ class CommandRouter:
 
     def _parse(self, line: str) -> Optional[tuple[str, List[str]]]:
         """
-        내부 파서: 접두사를 제거한 뒤 shlex로 토큰화합니다.
+        내부 파서: 접두사를 제거한 뒤 첫 토큰을 명령 이름으로 떼어 내고, 나머지 인자만 shlex로 토큰화합니다.
+        이름에 따옴표/백슬래시가 있으면 전체를 shlex로 토큰화합니다. 결과는 전체를 shlex.split한 것과 같습니다.
         반환: (명령어 이름, 인자 리스트) 또는 None(파싱 불가/비명령).
         """
         if not line:
@@ -78,16 +82,26 @@ class CommandRouter:
             return None
 
         payload = s[len(self._prefix):]
+        m = _COMMAND_NAME_RE.match(payload)
+        if not m:
+            return None
+        name = m.group(1)
+        rest = payload[m.end():]
+
+        # 명령 이름은 공백 분리만으로 충분하므로, shlex는 인자가 있을 때만 사용
+        if any(c in name for c in "'\"\\"):
+            rest, name = payload, ""
         try:
-            tokens = shlex.split(payload)
+            tokens = shlex.split(rest) if rest else []
         except ValueError:
-            # 따옴표 불일치 등 파싱 오류 시, 안전 폴백
-            tokens = payload.split()
-
-        if not tokens:
-            return None
-        name, args = tokens[0], tokens[1:]
-        return name, args
+            # 따옴표 불일치 등 파싱 오류 시, 안전 폴백 (이름이 멀쩡해도 전체가 shlex 실패이므로 전체를 공백 분리)
+            tokens, name = payload.split(), ""
+
+        if not name:
+            if not tokens:
+                return None
+            name, tokens = tokens[0], tokens[1:]
+        return name, tokens
 
     def dispatch(self, line: str) -> bool:
         """
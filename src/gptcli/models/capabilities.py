@@ -6,6 +6,7 @@ OpenRouter API에서 모델의 지원 기능(tool calling 등)을 확인합니
 """
 from __future__ import annotations
 
+import time
 import requests
 from functools import lru_cache
 from typing import Any, Dict, List, Optional, Set
@@ -16,23 +17,45 @@ import src.constants as constants
 # 캐시된 모델 정보 (메모리 캐시)
 _MODEL_CACHE: Dict[str, Dict[str, Any]] = {}
 
+# 모델 목록 조회용 HTTP 세션 (재시도 시 연결 재사용). 다른 모듈은 get_http_session()으로 가져다 씁니다.
+_HTTP = requests.Session()
+_HTTP.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8))
+_HTTP.headers["User-Agent"] = "gpt-cli-helper"
+
+# 조회 실패 후 재시도까지 대기할 시간(초). 그 전까지는 네트워크 요청 없이 실패로 처리합니다.
+_FETCH_RETRY_INTERVAL: float = 60.0
+_last_fetch_failure: float = 0.0
+
 
 def _fetch_models_if_needed() -> bool:
     """필요한 경우 모델 목록을 가져옵니다."""
-    global _MODEL_CACHE
+    global _MODEL_CACHE, _last_fetch_failure
     if _MODEL_CACHE:
         return True
+    # 직전 실패 직후라면 매 호출마다 최대 10초씩 다시 기다리지 않음
+    if _last_fetch_failure and time.monotonic() - _last_fetch_failure < _FETCH_RETRY_INTERVAL:
+        return False
 
     try:
-        response = requests.get(constants.API_URL, timeout=10)
+        response = _HTTP.get(constants.API_URL, timeout=10)
         response.raise_for_status()
         data = response.json().get("data", [])
         _MODEL_CACHE = {m['id']: m for m in data}
+        _last_fetch_failure = 0.0
         return True
     except Exception:
+        _last_fetch_failure = time.monotonic()
         return False
 
 
+def get_http_session() -> requests.Session:
+    """
+    OpenRouter 조회에 쓰는 공유 HTTP 세션을 반환합니다.
+    모델 목록을 가져오는 다른 모듈(ModelSearcher 등)도 이 세션을 써서 TLS 연결을 재사용합니다.
+    """
+    return _HTTP
+
+
 def get_model_info(model_id: str) -> Optional[Dict[str, Any]]:
     """
     특정 모델의 정보를 가져옵니다.
@@ -152,5 +175,6 @@ def get_models_with_tool_support() -> List[str]:
 
 def clear_cache() -> None:
     """모델 캐시를 초기화합니다."""
-    global _MODEL_CACHE
+    global _MODEL_CACHE, _last_fetch_failure
     _MODEL_CACHE = {}
+    _last_fetch_failure = 0.0
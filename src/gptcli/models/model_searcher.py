@@ -3,6 +3,7 @@ from __future__ import annotations
 import requests, urwid
 from typing import Any, Dict, List, Optional, Set, Tuple
 from rich.console import Console
+from src.gptcli.models.capabilities import get_http_session
 from src.gptcli.services.config import ConfigManager
 from src.gptcli.services.theme import ThemeManager
 import src.constants as constants
@@ -25,7 +26,8 @@ class ModelSearcher:
     def _fetch_all_models(self) -> bool:
         try:
             with self.console.status("[cyan]OpenRouter에서 모델 목록을 가져오는 중...", spinner="dots"):
-                response = requests.get(self.API_URL, timeout=10)
+                # 시작 시 모델 정보 조회에 쓴 세션을 재사용 (TLS 연결 재사용)
+                response = get_http_session().get(self.API_URL, timeout=10)
                 response.raise_for_status()
             self.all_models_map = {m['id']: m for m in response.json().get("data", [])}
             return True if self.all_models_map else False
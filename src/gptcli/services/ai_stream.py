@@ -1,16 +1,121 @@
 # src/gptcli/services/ai_stream.py
 from __future__ import annotations
+import asyncio
+import itertools
 import json
-import re, time, sys
-from typing import Any, Dict, List, Optional, Tuple
+import re, time, sys, threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
 from rich.console import Console
 from rich.panel import Panel
 from rich.syntax import Syntax
 from rich.live import Live
-from openai import OpenAI, OpenAIError
+from rich.rule import Rule
+from rich.text import Text
 import src.constants as constants
 from src.gptcli.models.capabilities import supports_reasoning
 
+if TYPE_CHECKING:
+    # openai(+httpx/pydantic)는 임포트 비용이 커서 첫 API 요청 시점에 불러옵니다.
+    from openai import OpenAI
+
+
+# 스트리밍 중 줄/조각마다 호출되는 펜스 판정용 정규식 (모듈 로드 시 1회 컴파일)
+_FENCE_START_RE = re.compile(r'^\s*(?P<fence>(?P<char>`){3,})[ \t]*(?P<info>[A-Za-z0-9_+\-.#]*)[ \t]*$')
+_FENCE_START_FRAGMENT_RE = re.compile(r'^\s*(`{3,})')
+
+# _simple_markdown_to_rich용 정규식 (스트리밍 flush마다 호출되므로 모듈 로드 시 1회 컴파일)
+# flush 단위가 문단(여러 줄)이므로 인라인 코드/굵게는 줄을 넘어가지 않게 제한
+# (한 줄에 짝 없는 백틱이나 '**'가 다음 줄의 것과 짝지어지면 스타일이 줄 경계를 넘어 새고 목록 기호 변환도 빠짐)
+_MD_INLINE_CODE_RE = re.compile(r"`([^`\n]+)`")
+_MD_BOLD_RE = re.compile(r"\*\*(?=\S)([^\n]+?)(?<=\S)\*\*")
+# 번호 목록("1. ")과 글머리 목록("- ", "* ")은 한 줄에서 동시에 성립할 수 없으므로 한 번의 패스로 처리
+_MD_LIST_MARKER_RE = re.compile(r"^(\s*)(?:(?P<num>\d+)\.|[\-\*]) ", re.MULTILINE)
+# 텍스트 중간(인라인 코드/굵게 바로 뒤)에서 시작하는 조각용: 조각의 첫 위치는 줄 시작이 아님
+_MD_LIST_MARKER_INNER_RE = re.compile(r"(?<=\n)(\s*)(?:(?P<num>\d+)\.|[\-\*]) ")
+
+
+def _md_list_marker_repl(m: re.Match) -> str:
+    num = m.group("num")
+    if num:
+        return f"{m.group(1)}[yellow]{num}.[/yellow] "
+    return f"{m.group(1)}[bold blue]•[/bold blue] "
+
+
+# 응답 머리의 구분 띠. 매번 Syntax(" ", ...)로 렉서를 만들지 않도록 한 번만 생성해 재사용합니다.
+_BANNER_TOP = Rule(characters=" ", style="on #F4F5F0")
+_BANNER_BOTTOM = Rule(characters=" ", style="on #008C45")
+_BANNER_MODEL_STYLE = "#f8f8f2 on #CD212A"
+# Raw 출력 모드에서 줄바꿈이 없어도 이 길이(문자 수)만큼 모이면 출력
+_RAW_FLUSH_CHARS = 4096
+# 추론/코드 Live 패널을 다시 그리는 최소 간격(초). 청크가 이보다 자주 와도 그리기는 건너뜀
+_LIVE_REFRESH_INTERVAL = 0.2
+
+
+@lru_cache(maxsize=32)
+def _fence_close_res(fence_char: str, fence_len: int) -> Tuple[re.Pattern, re.Pattern]:
+    """닫힘 펜스 판정용 (완전한 줄, 조각) 정규식 쌍을 (fence_char, fence_len)별로 캐시합니다."""
+    fence = rf'{re.escape(fence_char)}{{{max(3, fence_len)},}}'
+    return re.compile(rf'^\s*{fence}[ \t]*$'), re.compile(rf'^{fence}\s*$')
+
+
+def _tail_lines(text: str, n: int) -> List[str]:
+    """
+    text.splitlines()[-n:]와 같은 결과를 돌려주되, 끝에서부터 rfind로 n개의 줄바꿈만 찾아
+    그 뒤 조각만 나눕니다. (Live 패널 갱신마다 커지는 버퍼 전체를 훑지 않도록)
+    """
+    start = len(text) - 1 if text.endswith('\n') else len(text)
+    for _ in range(n):
+        start = text.rfind('\n', 0, start)
+        if start < 0:
+            break
+    return text[start + 1:].splitlines()[-n:]
+
+
+class _ThrottledLive:
+    """
+    auto_refresh=False인 Live 패널을 새 내용이 왔을 때만, 최대 _LIVE_REFRESH_INTERVAL 간격으로 다시 그립니다.
+    간격 안에 들어와 건너뛴 변경은 남은 시간 뒤에 타이머로 한 번 그려서,
+    다음 청크를 기다리는 동안(스트림이 멈춰 있어도) 패널이 마지막 내용을 보여 주도록 합니다.
+    Live를 멈추기 전에 반드시 cancel()을 호출해야 합니다.
+    """
+    def __init__(self, live: Live, build: Callable[[], Any]):
+        self.live = live
+        self.build = build  # 현재 버퍼로 패널을 만드는 함수 (그릴 때만 호출)
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._last_render = 0.0
+
+    def mark_dirty(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                return  # 예약된 그리기가 그 시점의 최신 버퍼를 읽음
+            wait = _LIVE_REFRESH_INTERVAL - (time.monotonic() - self._last_render)
+            if wait <= 0:
+                self._render()
+                return
+            self._timer = threading.Timer(wait, self._render_pending)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _render_pending(self) -> None:
+        with self._lock:
+            if self._timer is None:
+                return  # cancel() 이후에 깨어난 타이머
+            self._timer = None
+            self._render()
+
+    def _render(self) -> None:
+        self.live.update(self.build(), refresh=True)
+        self._last_render = time.monotonic()
+
+    def cancel(self) -> None:
+        """예약된 그리기를 취소합니다. 반환 후에는 이 객체가 Live를 건드리지 않습니다."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
 
 # ============================================================================
 # Tool Call 버퍼 헬퍼 (스트리밍 시 조각을 조합)
@@ -135,24 +240,42 @@ class AIStreamParser:
     OpenRouter API에서 받은 응답 스트림을 실시간으로 파싱하고 렌더링하는 클래스.
     복잡한 상태 머신을 내부에 캡슐화하여 관리합니다.
     """
-    def __init__(self, client: OpenAI, console: Console):
+    def __init__(
+        self,
+        console: Console,
+        client_options: Optional[Dict[str, Any]] = None,
+        client: Optional[OpenAI] = None,
+    ):
         """
         Args:
-            client (OpenAI): API 통신을 위한 OpenAI 클라이언트 인스턴스.
             console (Console): 출력을 위한 Rich Console 인스턴스.
+            client_options (Optional[Dict]): OpenAI 클라이언트 생성 인자(base_url, api_key 등).
+                주어지면 complete_many()가 같은 설정의 AsyncOpenAI로 요청을 동시에 보냅니다.
+            client (Optional[OpenAI]): 미리 만든 클라이언트. 없으면 첫 요청 시 client_options로 생성합니다.
         """
-        self.client = client
+        self._client = client
         self.console = console
+        self.client_options = client_options
         self._reset_state()
         # 출력 중복 방지용 마지막 플러시 스냅샷
         self._last_emitted: str = ""
+
+    @property
+    def client(self) -> OpenAI:
+        """API 통신용 OpenAI 클라이언트. 첫 접근 시 openai를 임포트하고 생성합니다."""
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(**(self.client_options or {}))
+        return self._client
+
     def _emit_markup(self, text: str) -> None:
         """중복 방지 후 마크업 텍스트 출력"""
         if not text:
             return
         if text == self._last_emitted:
             return
-        self.console.print(text, end="", highlight=False)
+        # '['가 없으면 태그도 이스케이프도 없으므로 마크업 파서를 거치지 않음 (줄바꿈/이모지 처리는 print 그대로)
+        self.console.print(text, end="", highlight=False, markup='[' in text)
         self._last_emitted = text
 
     def _emit_raw(self, text: str) -> None:
@@ -169,7 +292,7 @@ class AIStreamParser:
         self.full_reply: str = ""
         self.in_code_block: bool = False
         self.buffer: str = ""
-        self.code_buffer: str = ""
+        self.code_lines: List[str] = []  # 코드 블록 본문 (줄 단위로 모아 두고 필요할 때만 join)
         self.language: str = "text"
         self.normal_buffer: str = ""
         self.reasoning_buffer: str = ""
@@ -182,38 +305,80 @@ class AIStreamParser:
     def _simple_markdown_to_rich(self, text: str) -> str:
         """
         Rich 태그와 충돌하지 않도록 안전하게 마크다운 일부를 변환하는 렌더러.
-        원본의 로직을 그대로 유지합니다.
+        플레이스홀더 치환/복원 없이 왼쪽에서 오른쪽으로 한 번 훑으며 조각을 모아 합칩니다.
+        - 인라인 코드: 먼저 찾아 한 글자짜리 자리표시로 가려 둠 (굵게 판정이 코드 안을 보지 않도록)
+        - 굵게: 가린 문자열에서 찾고, 안쪽 텍스트는 그대로 둔 채 인라인 코드만 되돌림
+        - 그 외 일반 텍스트: '[' 이스케이프 + 목록 기호 변환
         """
-        placeholders: Dict[str, str] = {}
-        placeholder_id_counter = 0
-
-        def generate_placeholder(rich_tag_content: str) -> str:
-            nonlocal placeholder_id_counter
-            key = f"__GPCLI_PLACEHOLDER_{placeholder_id_counter}__"
-            placeholders[key] = rich_tag_content
-            placeholder_id_counter += 1
-            return key
-
-        def inline_code_replacer(match: re.Match) -> str:
-            content = match.group(1).strip()
-            if not content: return f"`{match.group(1)}`"
+        # 0) 대부분의 스트리밍 조각은 백틱도 '**'도 없는 일반 문장 → 전체가 하나의 일반 구간
+        if '`' not in text and '**' not in text:
+            if '[' in text:
+                text = text.replace('[', r'\[')
+            return _MD_LIST_MARKER_RE.sub(_md_list_marker_repl, text)
+
+        # 1) 인라인 코드 → 자리표시 문자 1개 (위치 → Rich 태그)
+        code_tags: Dict[int, str] = {}
+        pieces: List[str] = []
+        last = 0
+        masked_len = 0
+        for m in _MD_INLINE_CODE_RE.finditer(text):
+            content = m.group(1).strip()
+            if not content:
+                continue  # 공백뿐인 코드는 원문 그대로 둠
+            piece = text[last:m.start()]
+            pieces.append(piece)
+            masked_len += len(piece)
             escaped_content = content.replace('[', r'\[')
-            rich_tag = f"[bold white on #484f58] {escaped_content} [/]"
-            return generate_placeholder(rich_tag)
-
-        processed_text = re.sub(r"`([^`]+)`", inline_code_replacer, text)
-        
-        def bold_replacer(match: re.Match) -> str:
-            return generate_placeholder(f"[bold]{match.group(1)}[/bold]")
-
-        processed_text = re.sub(r"\*\*(?=\S)(.+?)(?<=\S)\*\*", bold_replacer, processed_text, flags=re.DOTALL)
-        processed_text = processed_text.replace('[', r'\[')
-        processed_text = re.sub(r"^(\s*)(\d+)\. ", r"\1[yellow]\2.[/yellow] ", processed_text, flags=re.MULTILINE)
-        processed_text = re.sub(r"^(\s*)[\-\*] ", r"\1[bold blue]•[/bold blue] ", processed_text, flags=re.MULTILINE)
-
-        for key in reversed(list(placeholders.keys())):
-            processed_text = processed_text.replace(key, placeholders[key])
-        return processed_text
+            code_tags[masked_len] = f"[bold white on #484f58] {escaped_content} [/]"
+            pieces.append("\x00")
+            masked_len += 1
+            last = m.end()
+        if code_tags:
+            pieces.append(text[last:])
+            masked = "".join(pieces)
+        else:
+            masked = text
+        code_positions = sorted(code_tags)
+        next_code = 0  # 아직 출력하지 않은 첫 인라인 코드의 code_positions 인덱스
+
+        out: List[str] = []
+
+        def emit_plain_run(start: int, end: int) -> None:
+            # 인라인 코드도 굵게도 없는 구간. 조각이 텍스트 맨 앞일 때만 첫 위치를 줄 시작으로 봄
+            if start >= end:
+                return
+            run = masked[start:end].replace('[', r'\[')
+            marker_re = _MD_LIST_MARKER_RE if start == 0 else _MD_LIST_MARKER_INNER_RE
+            out.append(marker_re.sub(_md_list_marker_repl, run))
+
+        def emit_span(start: int, end: int, plain: bool) -> None:
+            # [start, end) 구간을 인라인 코드 경계로 나눠 출력 (plain=False면 굵게 안쪽: 원문 그대로)
+            nonlocal next_code
+            pos = start
+            while next_code < len(code_positions) and code_positions[next_code] < end:
+                code_pos = code_positions[next_code]
+                if plain:
+                    emit_plain_run(pos, code_pos)
+                else:
+                    out.append(masked[pos:code_pos])
+                out.append(code_tags[code_pos])
+                pos = code_pos + 1
+                next_code += 1
+            if plain:
+                emit_plain_run(pos, end)
+            else:
+                out.append(masked[pos:end])
+
+        # 2) 굵게 구간과 그 사이 일반 구간을 순서대로 출력
+        pos = 0
+        for m in _MD_BOLD_RE.finditer(masked):
+            emit_span(pos, m.start(), plain=True)
+            out.append("[bold]")
+            emit_span(m.start(1), m.end(1), plain=False)
+            out.append("[/bold]")
+            pos = m.end()
+        emit_span(pos, len(masked), plain=True)
+        return "".join(out)
 
     def _collapse_reasoning_live_area(self, live: Live, clear_height: int):
         """
@@ -238,6 +403,69 @@ class AIStreamParser:
         esc = "\x1b"
         con.print(f"{esc}[{clear_height}F{esc}[{clear_height}M", end="", markup=False, highlight=False)
 
+    def complete_many(
+        self,
+        system_prompt: Dict[str, Any],
+        requests: List[List[Dict[str, Any]]],
+        model: str,
+        max_parallel: int = constants.SUMMARY_MAX_PARALLEL_REQUESTS,
+    ) -> List[Optional[str]]:
+        """
+        서로 독립적인 여러 요청을 동시에 보내고 응답 본문을 입력 순서대로 반환합니다.
+        스트리밍/실시간 렌더링 없이 결과만 필요한 경우(청크 분할 요약 등)에 사용합니다.
+
+        Args:
+            system_prompt (Dict): 모든 요청에 공통으로 붙는 시스템 프롬프트 객체.
+            requests (List[List[Dict]]): 요청별 메시지 목록.
+            model (str): 사용할 모델 이름.
+            max_parallel (int): 동시에 진행할 최대 요청 수.
+
+        Returns:
+            List[Optional[str]]: 요청별 응답 문자열. 실패한 항목은 None.
+        """
+        from openai import AsyncOpenAI, OpenAIError
+
+        model_online = model if model.endswith(":online") else f"{model}:online"
+        extra_body = {'reasoning': {}} if supports_reasoning(model) else {}
+
+        def params(msgs: List[Dict[str, Any]]) -> Dict[str, Any]:
+            return {"model": model_online, "messages": [system_prompt] + msgs, "extra_body": extra_body}
+
+        if not self.client_options:
+            # 비동기 클라이언트 설정이 없으면 기존 클라이언트로 순차 처리
+            results: List[Optional[str]] = []
+            for msgs in requests:
+                try:
+                    resp = self.client.chat.completions.create(**params(msgs))
+                    results.append(resp.choices[0].message.content)
+                except OpenAIError as e:
+                    self.console.print(f"[red]API 오류: {e}[/red]", highlight=False)
+                    results.append(None)
+            return results
+
+        async def run_all() -> List[Optional[str]]:
+            # httpx 연결 풀이 이벤트 루프에 묶이므로, 루프마다 클라이언트를 새로 만들고 닫습니다.
+            async with AsyncOpenAI(**self.client_options) as aclient:
+                sem = asyncio.Semaphore(max(1, max_parallel))
+
+                async def one(msgs: List[Dict[str, Any]]) -> Optional[str]:
+                    async with sem:
+                        try:
+                            resp = await aclient.chat.completions.create(**params(msgs))
+                            return resp.choices[0].message.content
+                        except OpenAIError as e:
+                            self.console.print(f"[red]API 오류: {e}[/red]", highlight=False)
+                            return None
+
+                return await asyncio.gather(*(one(m) for m in requests))
+
+        try:
+            with self.console.status(f"[cyan]Loading... ({len(requests)}개 요청 병렬 처리)", spinner="dots"):
+                return asyncio.run(run_all())
+        except KeyboardInterrupt:
+            self.console.print("\n[yellow]⚠️ 응답이 중단되었습니다.[/yellow]", highlight=False)
+            return [None] * len(requests)
+
     def stream_and_parse(
         self,
         system_prompt: Dict[str, Any],
@@ -261,58 +489,67 @@ class AIStreamParser:
             Optional[Tuple[str, Dict, List[Dict]]]: (전체 응답 문자열, 토큰 사용량 정보, tool_calls 목록) 튜플.
                                          실패 시 None.
         """
+        from openai import OpenAIError
+
         self._reset_state()
         usage_info = None
         finish_reason = None  # 응답 종료 이유 추적 (stop, tool_calls, length 등)
         tool_call_buffer = ToolCallBuffer()  # tool_calls 버퍼링용
 
-        model_online = model if model.endswith(":online") else f"{model}:online"
-
-        # 모델별 reasoning 지원 여부에 따라 extra_body 설정
-        # - Anthropic Claude: reasoning 지원 ✅
-        # - OpenAI GPT: reasoning 미지원 ❌ (지원하지 않는 파라미터 무시 또는 오류)
-        # - Google Gemini: tools + reasoning 동시 사용 시 오류 발생
-        #
-        # GPT 모델에 reasoning 파라미터를 보내면 "추론과정만 나오고 응답 종료" 현상 발생
-        is_gemini = "gemini" in model.lower()
-
-        if not supports_reasoning(model):
-            # GPT, Gemini 등 reasoning 미지원 모델
-            extra_body = {}
-        elif tools and is_gemini:
-            # Gemini + tools: reasoning 비활성화 (thought_signature 오류 방지)
-            extra_body = {}
-        else:
-            # Claude 등 reasoning 지원 모델
-            extra_body = {'reasoning': {}}
-
-        # API 호출 파라미터 구성
-        api_params = {
-            "model": model_online,
-            "messages": [system_prompt] + final_messages,
-            "stream": True,
-            "extra_body": extra_body,
-        }
+        try:
+            # 파라미터 구성부터 첫 청크 도착까지를 하나의 스피너로 감쌉니다.
+            with self.console.status("[cyan]Loading...", spinner="dots"):
+                model_online = model if model.endswith(":online") else f"{model}:online"
+
+                # 모델별 reasoning 지원 여부에 따라 extra_body 설정
+                # - Anthropic Claude: reasoning 지원 ✅
+                # - OpenAI GPT: reasoning 미지원 ❌ (지원하지 않는 파라미터 무시 또는 오류)
+                # - Google Gemini: tools + reasoning 동시 사용 시 오류 발생
+                #
+                # GPT 모델에 reasoning 파라미터를 보내면 "추론과정만 나오고 응답 종료" 현상 발생
+                is_gemini = "gemini" in model.lower()
+
+                reasoning_supported = supports_reasoning(model)
+                if not reasoning_supported:
+                    # GPT, Gemini 등 reasoning 미지원 모델
+                    extra_body = {}
+                elif tools and is_gemini:
+                    # Gemini + tools: reasoning 비활성화 (thought_signature 오류 방지)
+                    extra_body = {}
+                else:
+                    # Claude 등 reasoning 지원 모델
+                    extra_body = {'reasoning': {}}
+
+                # API 호출 파라미터 구성
+                api_params = {
+                    "model": model_online,
+                    "messages": [system_prompt] + final_messages,
+                    "stream": True,
+                    "extra_body": extra_body,
+                }
 
-        # tools가 제공된 경우 추가
-        if tools:
-            api_params["tools"] = tools
-            api_params["tool_choice"] = tool_choice
+                # tools가 제공된 경우 추가
+                if tools:
+                    api_params["tools"] = tools
+                    api_params["tool_choice"] = tool_choice
 
-            # GPT 모델 병렬 tool calling - 이제 활성화 (OpenRouter에서 수정됨)
-            # 이전에는 GPT-5/5.2에서 첫 번째 값만 반환되는 버그가 있었음
-            # 문제 발생 시 아래 주석 해제:
-            # is_gpt = "gpt" in model.lower() or "openai/" in model.lower()
-            # if is_gpt:
-            #     api_params["parallel_tool_calls"] = False
+                    # GPT 모델 병렬 tool calling - 이제 활성화 (OpenRouter에서 수정됨)
+                    # 이전에는 GPT-5/5.2에서 첫 번째 값만 반환되는 버그가 있었음
+                    # 문제 발생 시 아래 주석 해제:
+                    # is_gpt = "gpt" in model.lower() or "openai/" in model.lower()
+                    # if is_gpt:
+                    #     api_params["parallel_tool_calls"] = False
 
-            # 디버그: Tool 모드 활성화 상태 표시
-            choice_str = "[강제]" if tool_choice == "required" else "[자동]"
-            self.console.print(f"[dim]🔧 Tools 활성화: {len(tools)}개 도구 {choice_str}[/dim]", highlight=False)
+                    # 디버그: Tool 모드 활성화 상태 표시
+                    choice_str = "[강제]" if tool_choice == "required" else "[자동]"
+                    self.console.print(f"[dim]🔧 Tools 활성화: {len(tools)}개 도구 {choice_str}[/dim]", highlight=False)
 
-        try:
-            with self.console.status("[cyan]Loading...", spinner="dots"):
                 stream = self.client.chat.completions.create(**api_params)
+                # 응답 헤더만 온 시점이 아니라 첫 청크가 도착할 때까지 스피너를 유지하고,
+                # 받아 둔 첫 청크는 아래 루프에서 그대로 이어서 처리합니다.
+                stream_iter = iter(stream)
+                first_chunk = next(stream_iter, None)
+            stream = stream_iter if first_chunk is None else itertools.chain((first_chunk,), stream_iter)
         except KeyboardInterrupt:
             self.console.print("\n[yellow]⚠️ 응답이 중단되었습니다.[/yellow]", highlight=False)
             return None
@@ -321,13 +558,28 @@ class AIStreamParser:
             return None
 
         # 확연한 구분을 위함
-        self.console.print(Syntax(" ", "python", theme="monokai", background_color="#F4F5F0"))
-        model_name_syntax = Syntax(f"{model}:", "text", theme="monokai", background_color="#CD212A")
-        self.console.print(model_name_syntax)
-        self.console.print(Syntax(" ", "python", theme="monokai", background_color="#008C45"))
+        self.console.print(_BANNER_TOP)
+        self.console.print(Text(f"{model}:".ljust(self.console.width), style=_BANNER_MODEL_STYLE), highlight=False)
+        self.console.print(_BANNER_BOTTOM)
 
         # --- Raw 출력 모드 ---
         if not pretty_print:
+            # 청크를 모아 두었다가 마지막에 한 번만 합침 (full_reply += 의 반복 복사 방지)
+            reply_parts: List[str] = []
+            # 델타마다 console.print(락 + stdout write)를 호출하지 않도록 모아 두었다가
+            # 줄바꿈이 오거나, 일정 크기를 넘거나, 일정 시간이 지나면 한 번에 출력
+            pending: List[str] = []
+            pending_len = 0
+            last_write = time.time()
+
+            def flush_pending() -> None:
+                nonlocal pending_len, last_write
+                if pending:
+                    self.console.print("".join(pending), end="", markup=False, highlight=False)
+                    pending.clear()
+                    pending_len = 0
+                last_write = time.time()
+
             try:
                 for chunk in stream:
                     if hasattr(chunk, 'usage') and chunk.usage: usage_info = chunk.usage.model_dump()
@@ -342,16 +594,28 @@ class AIStreamParser:
                         # content 처리
                         content = getattr(delta, "reasoning", "") or getattr(delta, "content", "")
                         if content:
-                            self.full_reply += content
-                            self.console.print(content, end="", markup=False, highlight=False)
-            except KeyboardInterrupt: self.console.print("\n[yellow]⚠️ 응답 중단.[/yellow]", highlight=False)
+                            reply_parts.append(content)
+                            pending.append(content)
+                            pending_len += len(content)
+                            if ('\n' in content or pending_len >= _RAW_FLUSH_CHARS
+                                    or time.time() - last_write > constants.STREAM_FLUSH_INTERVAL):
+                                flush_pending()
+            except KeyboardInterrupt:
+                flush_pending()
+                self.console.print("\n[yellow]⚠️ 응답 중단.[/yellow]", highlight=False)
             except StopIteration: pass
-            finally: self.console.print()
+            finally:
+                flush_pending()
+                self.full_reply = "".join(reply_parts)
+                self.console.print()
             return self.full_reply, usage_info, tool_call_buffer.get_tool_calls()
 
         # --- Pretty Print 모드 (상태 머신) ---
         stream_iter = iter(stream)
         reasoning_live = code_live = None
+        reasoning_redraw = code_redraw = None
+        # Raw 모드와 마찬가지로 응답 조각을 모아 두고 종료 시 한 번만 합침
+        reply_parts: List[str] = []
 
         try:
             while True:
@@ -378,23 +642,31 @@ class AIStreamParser:
                 if has_reasoning:
                     # Live 패널 시작 전, 완성된 줄만 출력하고 조각은 버퍼에 남깁니다.
                     if self.normal_buffer and '\n' in self.normal_buffer:
-                        parts = self.normal_buffer.rsplit('\n', 1)
-                        text_to_flush, remainder = parts[0] + '\n', parts[1]
+                        # 리스트를 만드는 rsplit 대신 마지막 개행 위치에서 한 번 잘라 나눔
+                        cut = self.normal_buffer.rfind('\n') + 1
+                        text_to_flush = self.normal_buffer[:cut]
                         self._emit_markup(self._simple_markdown_to_rich(text_to_flush))
-                        self.normal_buffer = remainder # 조각은 남김
+                        self.normal_buffer = self.normal_buffer[cut:] # 조각은 남김
                     
-                    reasoning_live = Live(console=self.console, auto_refresh=True, refresh_per_second=4, transient=False)
+                    # 자동 갱신 스레드 대신, 새 내용이 왔을 때만 (최대 _LIVE_REFRESH_INTERVAL 간격으로) 다시 그림
+                    reasoning_live = Live(console=self.console, auto_refresh=False, transient=False)
                     reasoning_live.start()
                     self.reasoning_buffer = delta.reasoning
+                    reasoning_newlines = delta.reasoning.count('\n')  # 줄 수를 매번 세지 않도록 누적
                     reasoning_ended_with_tool_calls = False
+
+                    def build_reasoning_panel() -> Panel:
+                        text = self.reasoning_buffer
+                        lines = _tail_lines(text, 8)
+                        total_lines = reasoning_newlines + (0 if text.endswith('\n') else 1)
+                        display_text = "\n".join(f"[italic]{l}[/italic]" for l in lines)
+                        if total_lines > 8: display_text = f"[dim]... ({total_lines - 8}줄 생략) ...[/dim]\n{display_text}"
+                        return Panel(display_text, height=constants.REASONING_PANEL_HEIGHT, title=f"[magenta]🤔 추론 과정[/magenta]", border_style="magenta")
+
+                    reasoning_redraw = _ThrottledLive(reasoning_live, build_reasoning_panel)
+                    reasoning_redraw.mark_dirty()
                     while True: # Reasoning 내부 루프
                         try:
-                            lines, total_lines = self.reasoning_buffer.splitlines(), len(self.reasoning_buffer.splitlines())
-                            display_text = "\n".join(f"[italic]{l}[/italic]" for l in lines[-8:])
-                            if total_lines > 8: display_text = f"[dim]... ({total_lines - 8}줄 생략) ...[/dim]\n{display_text}"
-                            panel = Panel(display_text, height=constants.REASONING_PANEL_HEIGHT, title=f"[magenta]🤔 추론 과정[/magenta]", border_style="magenta")
-                            reasoning_live.update(panel)
-
                             chunk = next(stream_iter)
                             if hasattr(chunk, 'usage') and chunk.usage: usage_info = chunk.usage.model_dump()
                             if chunk.choices and chunk.choices[0].finish_reason:
@@ -405,6 +677,8 @@ class AIStreamParser:
                                 tool_call_buffer.add_delta(delta.tool_calls)
                             if hasattr(delta, 'reasoning') and delta.reasoning:
                                 self.reasoning_buffer += delta.reasoning
+                                reasoning_newlines += delta.reasoning.count('\n')
+                                reasoning_redraw.mark_dirty()
                             elif delta and delta.content:
                                 self.buffer += delta.content
                                 content_buffered_in_reasoning = True
@@ -415,12 +689,13 @@ class AIStreamParser:
                                 break
                         except StopIteration: break
 
+                    reasoning_redraw.cancel()
                     self._collapse_reasoning_live_area(reasoning_live, clear_height=constants.REASONING_PANEL_HEIGHT)
-                    reasoning_live = None
+                    reasoning_live = reasoning_redraw = None
 
                     # GPT: reasoning만 있고 content 없이 끝난 경우, reasoning을 full_reply에 저장
-                    if not supports_reasoning(model) and self.reasoning_buffer:
-                        self.full_reply = self.reasoning_buffer
+                    if not reasoning_supported and self.reasoning_buffer:
+                        reply_parts[:] = [self.reasoning_buffer]
 
                     if not (delta and delta.content) and not reasoning_ended_with_tool_calls:
                         continue
@@ -438,25 +713,36 @@ class AIStreamParser:
 
                 # content 또는 GPT의 reasoning을 full_reply에 추가
                 actual_content = delta.content if delta and delta.content else gpt_reasoning_as_content
-                self.full_reply += actual_content
+                reply_parts.append(actual_content)
                 if not content_buffered_in_reasoning:
                     self.buffer += actual_content
 
                 if not self.in_code_block and (self._looks_like_start_fragment(self.buffer) or self.buffer.endswith('`')):
                     continue
 
-                while "\n" in self.buffer:
-                    line, self.buffer = self.buffer.split("\n", 1)
+                # split("\n", 1)로 매 줄마다 남은 버퍼 전체를 복사하면 청크에 줄이 많을 때 O(줄 수 × 길이)가 되므로,
+                # 오프셋(pos)으로 줄을 읽고 버퍼는 마지막에 한 번만 잘라냅니다.
+                pos = 0
+                while True:
+                    nl = self.buffer.find("\n", pos)
+                    if nl < 0: break
+                    line = self.buffer[pos:nl]
+                    pos = nl + 1
                     
                     if not self.in_code_block:
-                        start = self._is_fence_start_line(line)
+                        # 펜스는 백틱 3개 이상이어야 하므로, 대부분의 일반 문장 줄은 정규식 판정 없이 통과
+                        start = self._is_fence_start_line(line) if '```' in line else None
                         if start:
+                            # 코드 블록 루프가 남은 버퍼를 이어서 소비하므로 여기서 확정
+                            self.buffer = self.buffer[pos:]
+                            pos = 0
                             # Live 패널 시작 전, 완성된 줄만 출력하고 조각은 버퍼에 남깁니다.
                             if self.normal_buffer and '\n' in self.normal_buffer:
-                                parts = self.normal_buffer.rsplit('\n', 1)
-                                text_to_flush, remainder = parts[0] + '\n', parts[1]
+                                # 리스트를 만드는 rsplit 대신 마지막 개행 위치에서 한 번 잘라 나눔
+                                cut = self.normal_buffer.rfind('\n') + 1
+                                text_to_flush = self.normal_buffer[:cut]
                                 self._emit_markup(self._simple_markdown_to_rich(text_to_flush))
-                                self.normal_buffer = remainder # 조각은 남김
+                                self.normal_buffer = self.normal_buffer[cut:] # 조각은 남김
                             elif self.normal_buffer and '\n' not in self.normal_buffer:
                                 # 조각만 있으면 출력하지 않고 넘어감
                                 pass
@@ -468,82 +754,109 @@ class AIStreamParser:
                             self.language = self.language or "text"
                             self.in_code_block = True
                             self.nesting_depth = 0
-                            self.code_buffer = ""
+                            self.code_lines = []
                             
-                            code_live = Live(console=self.console, auto_refresh=True, refresh_per_second=4, transient=False)
+                            code_live = Live(console=self.console, auto_refresh=False, transient=False)
                             code_live.start()
+
+                            def build_code_panel() -> Panel:
+                                lines = self.code_lines
+                                total_lines = len(lines)
+                                display_height = constants.CODE_PREVIEW_PANEL_HEIGHT - 2
+                                display_code = "\n".join(lines[-display_height:])
+                                if total_lines > display_height: display_code = f"... ({total_lines - display_height}줄 생략) ...\n{display_code}"
+
+                                live_syntax = Syntax(display_code, self.language, theme="monokai", background_color="#272822")
+                                panel_height = min(constants.CODE_PREVIEW_PANEL_HEIGHT, len(display_code.splitlines()) + 2)
+                                return Panel(live_syntax, height=panel_height, title=f"[yellow]코드 입력중 ({self.language})[/yellow]", border_style="dim")
+
+                            code_redraw = _ThrottledLive(code_live, build_code_panel)
+                            code_redraw.mark_dirty()
                             try:
                                 while self.in_code_block: # Code Block 내부 루프
-                                    lines = self.code_buffer.splitlines()
-                                    total_lines = len(lines)
-                                    display_height = constants.CODE_PREVIEW_PANEL_HEIGHT - 2
-                                    display_code = "\n".join(lines[-display_height:])
-                                    if total_lines > display_height: display_code = f"... ({total_lines - display_height}줄 생략) ...\n{display_code}"
-                                    
-                                    live_syntax = Syntax(display_code, self.language, theme="monokai", background_color="#272822")
-                                    panel_height = min(constants.CODE_PREVIEW_PANEL_HEIGHT, len(display_code.splitlines()) + 2)
-                                    temp_panel = Panel(live_syntax, height=panel_height, title=f"[yellow]코드 입력중 ({self.language})[/yellow]", border_style="dim")
-                                    code_live.update(temp_panel)
-                                    
                                     chunk = next(stream_iter)
                                     if hasattr(chunk, 'usage') and chunk.usage: usage_info = chunk.usage.model_dump()
                                     delta = chunk.choices[0].delta if (chunk.choices and chunk.choices[0]) else None
                                     if delta and delta.content:
-                                        self.full_reply += delta.content
+                                        reply_parts.append(delta.content)
                                         self.buffer += delta.content
 
-                                    while "\n" in self.buffer:
-                                        sub_line, self.buffer = self.buffer.split("\n", 1)
-                                        close_now = self._is_fence_close_line(sub_line, self.outer_fence_char, self.outer_fence_len)
-                                        start_in_code = self._is_fence_start_line(sub_line)
+                                    sub_pos = 0
+                                    code_line_count = len(self.code_lines)
+                                    while True:
+                                        sub_nl = self.buffer.find("\n", sub_pos)
+                                        if sub_nl < 0: break
+                                        sub_line = self.buffer[sub_pos:sub_nl]
+                                        sub_pos = sub_nl + 1
+                                        maybe_fence = '```' in sub_line  # 펜스가 될 수 없는 코드 줄은 판정 생략
+                                        close_now = maybe_fence and self._is_fence_close_line(sub_line, self.outer_fence_char, self.outer_fence_len)
+                                        start_in_code = maybe_fence and self._is_fence_start_line(sub_line)
 
                                         if start_in_code and start_in_code[1] >= self.outer_fence_len and start_in_code[2]:
                                             self.nesting_depth += 1
-                                            self.code_buffer += sub_line + "\n"
+                                            self.code_lines.append(sub_line)
                                         elif close_now:
                                             if self.nesting_depth > 0: self.nesting_depth -= 1
                                             else: self.in_code_block = False; break
-                                            self.code_buffer += sub_line + "\n"
-                                        else: self.code_buffer += sub_line + "\n"
+                                            self.code_lines.append(sub_line)
+                                        else: self.code_lines.append(sub_line)
+                                    self.buffer = self.buffer[sub_pos:]
                                     if not self.in_code_block: break
+                                    if len(self.code_lines) != code_line_count:
+                                        code_redraw.mark_dirty()
 
                                     if self.buffer and self._looks_like_close_fragment(self.buffer, self.outer_fence_char, self.outer_fence_len): continue
                             finally:
-                                if self.code_buffer.rstrip():
-                                    syntax_block = Syntax(self.code_buffer.rstrip(), self.language, theme="monokai", line_numbers=True, word_wrap=True)
+                                code_redraw.cancel()
+                                code_redraw = None
+                                code_text = "\n".join(self.code_lines).rstrip()
+                                if code_text:
+                                    syntax_block = Syntax(code_text, self.language, theme="monokai", line_numbers=True, word_wrap=True)
                                     code_live.update(Panel(syntax_block, title=f"[green]코드 ({self.language})[/green]", border_style="green"))
                                 code_live.stop()
                         else: self.normal_buffer += line + "\n"
                     else: # 방어 코드
-                        self.code_buffer += line + "\n"
+                        self.code_lines.append(line)
+                if pos:
+                    self.buffer = self.buffer[pos:]
 
                 if not self.in_code_block and self.buffer:
                     if not self._looks_like_start_fragment(self.buffer):
                         self.normal_buffer += self.buffer
                         self.buffer = ""
                 
-                if self.normal_buffer and (len(self.normal_buffer) > 5 or (time.time() - self.last_flush_time > 0.25)):
-                    if '\n' in self.normal_buffer:
-                        parts = self.normal_buffer.rsplit('\n', 1)
-                        text_to_flush, self.normal_buffer = parts[0] + '\n', parts[1]
-                        #self.console.print(self._simple_markdown_to_rich(text_to_flush), end="", highlight=False)
+                # 문단 경계(빈 줄)가 보일 때만 모아서 출력하고, 문단이 길어지면 일정 시간마다 완성된 줄까지 출력
+                # (청크마다 짧은 조각을 변환/출력하던 것을 줄여 정규식 패스와 console.print 호출 횟수를 줄임)
+                if self.normal_buffer:
+                    cut = self.normal_buffer.rfind('\n\n') + 2
+                    if cut < 2:
+                        cut = 0
+                        if time.time() - self.last_flush_time > constants.STREAM_FLUSH_INTERVAL:
+                            cut = self.normal_buffer.rfind('\n') + 1
+                    if cut:
+                        text_to_flush, self.normal_buffer = self.normal_buffer[:cut], self.normal_buffer[cut:]
                         self._emit_markup(self._simple_markdown_to_rich(text_to_flush))
                         self.last_flush_time = time.time()
         
         except (KeyboardInterrupt, StopIteration):
+            for redraw in (reasoning_redraw, code_redraw):
+                if redraw is not None: redraw.cancel()
             if isinstance(reasoning_live, Live) and reasoning_live.is_started: self._collapse_reasoning_live_area(reasoning_live, constants.REASONING_PANEL_HEIGHT)
             if isinstance(code_live, Live) and code_live.is_started: code_live.stop()
             if isinstance(sys.exc_info()[1], KeyboardInterrupt): 
                 self.console.print("\n[yellow]⚠️ 응답이 중단되었습니다.[/yellow]", highlight=False)
 
         finally: # 스트림이 정상/비정상 종료될 때 마지막 남은 버퍼 처리
+            self.full_reply = "".join(reply_parts)
             if self.normal_buffer: 
                 #self.console.print(self._simple_markdown_to_rich(self.normal_buffer), end="", highlight=False)
                 self._emit_markup(self._simple_markdown_to_rich(self.normal_buffer))
                 self.normal_buffer = ""
-            if self.in_code_block and self.code_buffer:
+            if self.in_code_block and self.code_lines:
                 self.console.print("\n[yellow]경고: 코드 블록이 제대로 닫히지 않았습니다.[/yellow]", highlight=False)
-                self.console.print(Syntax(self.code_buffer.rstrip(), self.language, theme="monokai", line_numbers=True), highlight=False)
+                self.console.print(Syntax("\n".join(self.code_lines).rstrip(), self.language, theme="monokai", line_numbers=True), highlight=False)
+            for redraw in (reasoning_redraw, code_redraw):
+                if redraw is not None: redraw.cancel()
             if reasoning_live and reasoning_live.is_started: self._collapse_reasoning_live_area(reasoning_live, constants.REASONING_PANEL_HEIGHT)
             if code_live and code_live.is_started: code_live.stop()
 
@@ -607,20 +920,13 @@ class AIStreamParser:
             return None
         s = line.rstrip("\r")
         # 모든 들여쓰기 허용
-        m = re.match(r'^\s*(?P<fence>(?P<char>`){3,})[ \t]*(?P<info>[A-Za-z0-9_+\-.#]*)[ \t]*$', s)
+        m = _FENCE_START_RE.match(s)
         if not m:
             return None
 
         fence_char = m.group('char')
-        # fence 연속 길이 산출
-        n = 0
-        for ch in s.lstrip():
-            if ch == fence_char:
-                n += 1
-            else:
-                break
-        if n < 3:
-            return None
+        # info 토큰에는 백틱이 올 수 없으므로 fence 그룹 길이가 곧 연속 길이
+        n = len(m.group('fence'))
 
         info = (m.group('info') or "").strip()
         # info는 '한 개 토큰'만 허용(공백 불가) → 정규식에서 이미 보장됨
@@ -635,8 +941,7 @@ class AIStreamParser:
         if line is None:
             return False
         s = line.rstrip("\r")
-        pattern = rf'^\s*{re.escape(fence_char)}{{{max(3, fence_len)},}}[ \t]*$'
-        return re.match(pattern, s) is not None
+        return _fence_close_res(fence_char, fence_len)[0].match(s) is not None
 
     @staticmethod
     def _looks_like_start_fragment(fragment: str) -> bool:
@@ -645,7 +950,7 @@ class AIStreamParser:
         """
         if not fragment or "\n" in fragment:
             return False
-        return re.match(r'^\s*(`{3,})', fragment) is not None
+        return _FENCE_START_FRAGMENT_RE.match(fragment) is not None
 
     @staticmethod
     def _looks_like_close_fragment(fragment: str, fence_char: str, fence_len: int) -> bool:
@@ -655,4 +960,4 @@ class AIStreamParser:
         if not fragment or "\n" in fragment:
             return False
         s = fragment.strip()
-        return re.match(rf'^{re.escape(fence_char)}{{{max(3, fence_len)},}}\s*$', s) is not None
+        return _fence_close_res(fence_char, fence_len)[1].match(s) is not None
@@ -1,25 +1,66 @@
 # src/gptcli/services/config.py
 from __future__ import annotations
-import json, base64, time, shutil, os, re
+import mmap, time, shutil, os, re, threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple, Set
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Set, TYPE_CHECKING
 from pathspec import PathSpec
 import src.constants as constants
 from src.gptcli.utils.common import Utils
 
+if TYPE_CHECKING:
+    from rich.console import Console
+
 class ConfigManager:
     """
     설정 파일, 경로, 세션, 즐겨찾기 등 모든 파일 시스템 I/O를 관리하는 클래스.
     이 클래스의 인스턴스는 애플리케이션 설정의 단일 진실 공급원이 됩니다.
     """
-    def __init__(self, base_dir: Optional[Path] = None, config_dir: Optional[Path] = None):
+    # 코드 블록 언어 태그 → 저장 확장자 (저장할 때마다 dict를 다시 만들지 않도록 클래스 상수로 둠)
+    _CODE_BLOCK_EXTS: Dict[str, str] = {
+        # 스크립팅 & 프로그래밍 언어
+        "python": "py", "py": "py",
+        "javascript": "js", "js": "js",
+        "typescript": "ts", "ts": "ts",
+        "bash": "sh", "sh": "sh", "shell": "sh",
+        "java": "java",
+        "c": "c",
+        "cpp": "cpp", "c++": "cpp",
+        "go": "go",
+        "rust": "rs", "rs": "rs",
+        "ruby": "rb", "rb": "rb",
+        "php": "php",
+        "sql": "sql",
+        
+        # 마크업 & 데이터 형식
+        "html": "html",
+        "css": "css",
+        "scss": "scss",
+        "json": "json",
+        "xml": "xml",
+        "yaml": "yml", "yml": "yml",
+        "markdown": "md", "md": "md",
+        
+        # 기타
+        "text": "txt", "plaintext": "txt",
+        "diff": "diff",
+    }
+
+    def __init__(
+        self,
+        base_dir: Optional[Path] = None,
+        config_dir: Optional[Path] = None,
+        console: Optional[Console] = None,
+    ):
         """
         모든 경로를 초기화하고 필요한 디렉터리와 기본 설정 파일을 생성합니다.
 
         Args:
             base_dir (Optional[Path]): 프로젝트의 루트 디렉터리. 기본값은 현재 작업 디렉터리.
             config_dir (Optional[Path]): 설정 디렉터리 (현재 미사용, 하위 호환성 유지).
+            console (Optional[Console]): 세션 저장 경고를 출력할 콘솔. 없으면 print로 출력합니다.
         """
+        self.console = console
         # --- 경로 정의 ---
         self.BASE_DIR = Path(base_dir) if base_dir else Path.cwd()
         self.CONFIG_DIR = (config_dir or Path.home() / "codes" / "gpt_cli").resolve()
@@ -29,6 +70,7 @@ class ConfigManager:
 
         self.MD_OUTPUT_DIR = self.BASE_DIR / "gpt_markdowns"
         self.CODE_OUTPUT_DIR = self.BASE_DIR / "gpt_codes"
+        self.RESPONSE_CACHE_DIR = self.BASE_DIR / ".gpt_cache"
 
         # --- 파일 경로 정의 ---
         self.PROMPT_HISTORY_FILE = self.BASE_DIR / ".gpt_prompt_history.txt"
@@ -40,6 +82,29 @@ class ConfigManager:
         # 현재 세션 포인터 파일(.gpt_session)
         self.CURRENT_SESSION_FILE = self.BASE_DIR / ".gpt_session"
 
+        # --- 메모리 캐시 ---
+        # 즐겨찾기: (파일 mtime, 파싱된 dict). 외부 수정 시 mtime으로 무효화
+        self._favorites_cache: Optional[Tuple[float, Dict[str, str]]] = None
+        # ignore spec: (관련 파일들의 (mtime_ns, size) 튜플, PathSpec). 파일이 바뀌면 다시 빌드
+        self._ignore_spec_cache: Optional[Tuple[Tuple[Tuple[int, int], ...], Optional[PathSpec]]] = None
+        # ignore spec이 의존하는 파일들 (전역/프로젝트 .gptignore가 같은 파일이면 한 번만 stat)
+        self._ignore_source_files: Tuple[Path, ...] = tuple(dict.fromkeys(
+            (self.DEFAULT_IGNORE_FILE, self.IGNORE_FILE, self.BASE_DIR / ".gitignore")
+        ))
+        # is_ignored 판정 결과: (판정에 쓴 PathSpec, {경로 문자열: 무시 여부}). spec이 바뀌면 비움
+        self._ignore_match_cache: Tuple[Optional[PathSpec], Dict[str, bool]] = (None, {})
+        # 세션별 턴 로그(JSONL)에 쌓인 항목 수
+        self._journal_counts: Dict[str, int] = {}
+        # 턴 로그 추가에 실패한 세션. 이후 기록의 base가 어긋나므로 다음 턴에 전체 저장으로 다시 맞춤
+        self._journal_failed: Set[str] = set()
+        # 백그라운드 쓰기 실패 (턴 로그 세션명 또는 None, 경고 문구). 작업자 스레드는 기록만 하고,
+        # 출력과 _journal_failed 반영은 메인 스레드(_drain_write_failures)에서 처리 (프롬프트/Live 화면 보호)
+        self._write_failures: List[Tuple[Optional[str], str]] = []
+        self._write_failures_lock = threading.Lock()
+        # 턴마다 생기는 작은 기록(턴 로그, 응답 캐시)을 순서대로 처리하는 단일 백그라운드 작업자.
+        # 직렬화는 호출 시점에 끝내고 파일 쓰기만 넘기므로, 다음 프롬프트가 디스크 I/O를 기다리지 않습니다.
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gptcli-writer")
+
         # --- 자동 초기화 ---
         self._initialize_directories()
         self._create_default_ignore_file_if_not_exists()
@@ -104,6 +169,7 @@ env/
 
 # --- 이 앱 자체의 파일들 ---
 .gpt_sessions/
+.gpt_cache/
 .gpt_prompt_history.txt
 .gpt_favorites.json
 .gptignore
@@ -154,6 +220,180 @@ __init__.py
         """세션 이름에 해당하는 파일 경로를 반환합니다."""
         return self.SESSION_DIR / f"session_{name}.json"
 
+    def get_session_journal_path(self, name: str) -> Path:
+        """세션의 턴 단위 추가 기록(JSONL) 파일 경로를 반환합니다."""
+        return self.SESSION_DIR / f"session_{name}.jsonl"
+
+    def append_session_turn(
+        self,
+        name: str,
+        new_msgs: List[Dict],
+        base_count: int,
+        usage: Optional[Dict] = None,
+        model: Optional[str] = None,
+        context_length: Optional[int] = None,
+        mode: Optional[str] = None,
+    ) -> int:
+        """
+        한 턴에서 추가된 메시지만 JSONL 로그에 한 줄로 덧붙입니다.
+        매 턴 전체 세션 JSON을 다시 쓰는 대신 O(메시지) 만큼만 기록합니다.
+
+        Args:
+            base_count: new_msgs를 추가하기 직전의 메시지 수.
+                        로드 시 스냅샷과 로그가 겹치는지 판단하는 데 사용합니다.
+
+        Returns:
+            현재 로그에 쌓인 항목 수 (호출자가 save_session으로 합칠 시점을 판단).
+            앞선 턴 로그 쓰기가 실패했으면 기록하지 않고 SESSION_JOURNAL_COMPACT_TURNS 이상을 반환해
+            호출자가 곧바로 전체 저장하도록 합니다.
+        """
+        self._drain_write_failures()
+        if name in self._journal_failed:
+            # 앞선 기록이 유실되어 로그만으로는 복원되지 않으므로, 이번 턴은 로그 대신 전체 저장으로 다시 맞춤
+            return max(self._journal_counts.get(name, 0), constants.SESSION_JOURNAL_COMPACT_TURNS)
+
+        entry = {
+            "base": base_count,
+            "messages": new_msgs,
+            "usage": usage,
+            "model": model,
+            "context_length": context_length,
+            "mode": mode,
+        }
+        line = Utils._json_dumps(entry) + b"\n"
+        self._submit_write(
+            f"세션 '{name}' 턴 로그", self._append_bytes, self.get_session_journal_path(name), line,
+            journal_session=name,
+        )
+        self._journal_counts[name] = self._journal_counts.get(name, 0) + 1
+        return self._journal_counts[name]
+
+    def _submit_write(
+        self, what: str, fn: Callable[..., Any], *args: Any, journal_session: Optional[str] = None
+    ) -> Future:
+        """
+        쓰기 작업을 백그라운드 작업자에 넘깁니다. 실패하면 작업자 스레드에서는 기록만 해 두고,
+        경고 출력은 다음 append_session_turn/flush_writes 때 메인 스레드에서 합니다.
+        """
+        future = self._writer.submit(fn, *args)
+
+        def record_failure(f: Future) -> None:
+            exc = f.exception()
+            if exc is not None:
+                with self._write_failures_lock:
+                    self._write_failures.append((journal_session, f"{what} 저장 실패: {exc}"))
+
+        future.add_done_callback(record_failure)
+        return future
+
+    def _drain_write_failures(self) -> None:
+        """작업자 스레드가 기록한 쓰기 실패를 경고로 출력하고, 턴 로그가 끊긴 세션을 표시합니다."""
+        with self._write_failures_lock:
+            failures, self._write_failures = self._write_failures, []
+        for session, message in failures:
+            if session is not None:
+                self._journal_failed.add(session)
+            self._warn(message)
+
+    def _warn(self, message: str) -> None:
+        if self.console is not None:
+            escaped = message.replace('[', r'\[')
+            self.console.print(f"[yellow]경고: {escaped}[/yellow]", highlight=False)
+        else:
+            print(f"[경고] {message}")
+
+    @staticmethod
+    def _append_bytes(path: Path, data: bytes) -> None:
+        try:
+            with path.open("ab") as f:
+                f.write(data)
+        except FileNotFoundError:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("ab") as f:
+                f.write(data)
+
+    @staticmethod
+    def _write_bytes(path: Path, data: bytes) -> None:
+        try:
+            path.write_bytes(data)
+        except FileNotFoundError:
+            # 디렉터리는 시작 시 한 번 만들어 두므로, 실행 중 삭제된 경우에만 재생성
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+
+    def save_response_markdown(self, path: Path, text: str) -> None:
+        """
+        응답 마크다운 파일을 기록합니다. 실패하면 OSError를 그대로 올립니다.
+        저장 완료 안내가 실제 결과와 맞도록 백그라운드 작업자에 넘기지 않고 바로 씁니다 (파일 하나 분량).
+        """
+        self._write_bytes(path, text.encode("utf-8"))
+
+    def flush_writes(self) -> None:
+        """백그라운드 작업자에 넘긴 쓰기가 모두 끝날 때까지 기다립니다."""
+        # 작업자가 하나라서 제출 순서대로 실행되므로, 마지막 빈 작업이 끝나면 앞선 쓰기도 모두 끝난 상태
+        self._writer.submit(lambda: None).result()
+        self._drain_write_failures()
+
+    def _replay_session_journal(self, name: str, data: Dict[str, Any]) -> bool:
+        """
+        JSONL 로그를 세션 데이터에 이어 붙입니다.
+        이미 스냅샷에 반영된 항목(base 불일치)과 깨진 줄은 건너뜁니다.
+        반환: 로그 파일이 존재했는지 여부
+        """
+        self.flush_writes()
+        path = self.get_session_journal_path(name)
+        try:
+            with path.open("rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return True
+                gaps = 0
+                # 파일 전체를 복사하거나 줄 리스트를 만들지 않고, 매핑된 버퍼에서 한 줄씩 잘라 파싱
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    gaps = self._apply_journal_records(mm, data)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            # 읽지 못한 로그는 합치면서 지우지 않도록 남겨 둠
+            self._warn(f"세션 '{name}' 턴 로그를 읽지 못했습니다: {e}")
+            return False
+        if gaps:
+            self._warn(f"세션 '{name}' 턴 로그에서 앞선 기록이 빠져 이어 붙이지 못한 항목 {gaps}개를 건너뛰었습니다.")
+        return True
+
+    @staticmethod
+    def _apply_journal_records(buf: mmap.mmap, data: Dict[str, Any]) -> int:
+        """
+        개행으로 구분된 JSONL 레코드를 순서대로 세션 데이터에 반영합니다.
+        base가 현재 메시지 수보다 작은 기록은 이미 스냅샷에 들어 있으므로 건너뛰고,
+        큰 기록은 앞선 기록이 유실된 것이라 이어 붙일 수 없으므로 건너뜁니다.
+        반환: 이어 붙이지 못하고 건너뛴(base가 앞서 있는) 기록 수
+        """
+        pos, size = 0, len(buf)
+        gaps = 0
+        while pos < size:
+            nl = buf.find(b"\n", pos)
+            end = size if nl == -1 else nl
+            raw = buf[pos:end]
+            pos = end + 1
+            if not raw.strip():
+                continue
+            try:
+                entry = Utils._json_loads(raw)
+            except ValueError:
+                continue  # 비정상 종료로 잘린 줄 (JSON/UTF-8 디코드 오류)
+            base = entry.get("base")
+            if base != len(data["messages"]):
+                if isinstance(base, int) and base > len(data["messages"]):
+                    gaps += 1
+                continue
+            data["messages"].extend(entry.get("messages") or [])
+            if entry.get("usage"):
+                data["usage_history"].append(entry["usage"])
+            for key in ("model", "context_length", "mode"):
+                if entry.get(key) is not None:
+                    data[key] = entry[key]
+        return gaps
+
     def load_session(self, name: str) -> Dict[str, Any]:
         """지정된 이름의 세션 데이터를 로드합니다."""
         default_data = {
@@ -167,14 +407,21 @@ __init__.py
         path = self.get_session_path(name)
         data = Utils._load_json(path, default_data)
 
-        # 레거시 형식 (message 리스트만 있던 경우) 호환
+        # 레거시 형식 (message 리스트만 있던 경우) 호환. 턴 로그가 있으면 아래에서 이어 붙이고 새 형식으로 저장
         if isinstance(data, list):
-            return {"messages": data, **{k:v for k,v in default_data.items() if k != 'messages'}}
+            data = {"messages": data, **{k:v for k,v in default_data.items() if k != 'messages'}}
 
         # 키가 없는 경우 기본값으로 채워줌
         for key, value in default_data.items():
             data.setdefault(key, value)
 
+        # 턴 로그가 남아 있으면 반영한 뒤 전체 JSON으로 합쳐 로그를 비움
+        if self._replay_session_journal(name, data):
+            self.save_session(
+                name, data["messages"], data["model"], data["context_length"], data["usage_history"],
+                mode=data["mode"], summary_history=data["summary_history"],
+            )
+
         return data
 
     def save_session(
@@ -195,9 +442,11 @@ __init__.py
         """
         path = self.get_session_path(name)
         existing = {}
-        if path.exists():
+        # 기존 파일은 mode/summary_history를 이어받을 때만 필요하므로, 둘 다 주어지면 읽지 않음
+        # (load_session에서 턴 로그를 합칠 때는 방금 읽은 파일을 다시 파싱하지 않게 됨)
+        if (mode is None or summary_history is None) and path.exists():
             try:
-                existing = json.loads(path.read_text(encoding="utf-8"))
+                existing = Utils._json_loads(path.read_bytes())
             except Exception:
                 existing = {}
 
@@ -223,7 +472,12 @@ __init__.py
             },
             "last_updated": time.strftime("%Y-%m-%d %H:%M:%S")
         }
-        Utils._save_json(path, data)
+        if Utils._save_json(path, data):
+            # 전체 스냅샷에 모두 반영되었으므로 턴 로그는 비움 (대기 중인 로그 쓰기를 먼저 끝냄)
+            self.flush_writes()
+            self.get_session_journal_path(name).unlink(missing_ok=True)
+            self._journal_counts.pop(name, None)
+            self._journal_failed.discard(name)
 
     def _session_name_from_backup_json(self, path: Path) -> Optional[str]:
         """
@@ -231,8 +485,7 @@ __init__.py
         우선순위: backup_meta.session > name > 파일명(session_<slug>.json)
         """
         try:
-            text = path.read_text(encoding="utf-8")
-            data = json.loads(text)
+            data = Utils._json_loads(path.read_bytes())
             meta = data.get("backup_meta") or {}
             name = meta.get("session") or data.get("name")
             if not name:
@@ -302,20 +555,85 @@ __init__.py
 
     # --- Favorites Management ---
     
+    def _favorites_mtime(self) -> float:
+        return self._mtime_or_zero(self.FAVORITES_FILE)
+
     def load_favorites(self) -> Dict[str, str]:
-        """즐겨찾기 데이터를 로드합니다."""
-        return Utils._load_json(self.FAVORITES_FILE, {})
+        """
+        즐겨찾기 데이터를 로드합니다.
+        파싱 결과를 메모리에 캐시하고, 파일 mtime이 바뀐 경우에만 다시 읽습니다.
+        """
+        mtime = self._favorites_mtime()
+        if self._favorites_cache is None or self._favorites_cache[0] != mtime:
+            self._favorites_cache = (mtime, Utils._load_json(self.FAVORITES_FILE, {}))
+        return self._favorites_cache[1]
 
     def save_favorite(self, name: str, prompt: str) -> None:
-        """새로운 즐겨찾기를 저장합니다."""
+        """새로운 즐겨찾기를 저장합니다. 캐시된 dict를 갱신한 뒤 한 번만 기록합니다."""
         favs = self.load_favorites()
         favs[name] = prompt
         Utils._save_json(self.FAVORITES_FILE, favs)
+        self._favorites_cache = (self._favorites_mtime(), favs)
+
+    # --- Response Cache ---
+
+    def load_cached_response(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시 키에 해당하는 저장된 응답({"reply", "model", "saved_at"})을 반환합니다. 없으면 None.
+        파일 수정 시각이 RESPONSE_CACHE_MAX_AGE보다 오래됐으면 파일을 지우고 None을 반환합니다.
+        """
+        path = self.RESPONSE_CACHE_DIR / f"{key}.json"
+        try:
+            if time.time() - path.stat().st_mtime > constants.RESPONSE_CACHE_MAX_AGE:
+                path.unlink()
+                return None
+        except OSError:
+            return None
+        data = Utils._load_json(path, {})
+        return data if isinstance(data.get("reply"), str) else None
+
+    def save_cached_response(self, key: str, reply: str, model: str) -> None:
+        """응답을 캐시에 저장합니다 (백그라운드). 실패해도 흐름을 막지 않습니다."""
+        self._submit_write(
+            "응답 캐시",
+            Utils._save_json,
+            self.RESPONSE_CACHE_DIR / f"{key}.json",
+            {"reply": reply, "model": model, "saved_at": time.strftime("%Y-%m-%d %H:%M:%S")},
+        )
 
     # --- Ignore File Management ---
 
+    @staticmethod
+    def _mtime_or_zero(path: Path) -> float:
+        try:
+            return path.stat().st_mtime
+        except OSError:
+            return 0.0
+
+    @staticmethod
+    def _file_signature(path: Path) -> Tuple[int, int]:
+        """(mtime_ns, size). 파일이 없으면 (0, -1). 같은 초 안의 수정도 구분합니다."""
+        try:
+            st = path.stat()
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return 0, -1
+
     def get_ignore_spec(self) -> Optional[PathSpec]:
-        """전역 및 프로젝트 .gptignore 파일을 결합하여 PathSpec 객체를 생성합니다."""
+        """
+        전역 및 프로젝트 .gptignore 파일을 결합하여 PathSpec 객체를 생성합니다.
+        자동완성/파일 선택기에서 매우 자주 호출되므로, 관련 파일의 (mtime_ns, size)가
+        바뀌지 않았다면 이전에 만든 PathSpec을 그대로 반환합니다.
+        """
+        key = tuple(self._file_signature(p) for p in self._ignore_source_files)
+        if self._ignore_spec_cache is not None and self._ignore_spec_cache[0] == key:
+            return self._ignore_spec_cache[1]
+
+        spec = self._build_ignore_spec()
+        self._ignore_spec_cache = (key, spec)
+        return spec
+
+    def _build_ignore_spec(self) -> Optional[PathSpec]:
         default_patterns = []
         if self.DEFAULT_IGNORE_FILE.exists():
             default_patterns = self.DEFAULT_IGNORE_FILE.read_text('utf-8').splitlines()
@@ -341,79 +659,86 @@ __init__.py
 
         return PathSpec.from_lines("gitwildmatch", final_patterns) if final_patterns else None
 
-    def is_ignored(self, path: Path, spec: Optional[PathSpec]) -> bool:
-        """주어진 경로가 ignore spec에 의해 무시되어야 하는지 확인합니다."""
+    def is_ignored(self, path: Path, spec: Optional[PathSpec], is_dir: Optional[bool] = None) -> bool:
+        """
+        주어진 경로가 ignore spec에 의해 무시되어야 하는지 확인합니다.
+        is_dir를 이미 알고 있으면(scandir 결과 등) 넘겨서 stat 호출을 생략할 수 있습니다.
+        파일 선택기는 화면을 갱신할 때마다 같은 경로를 반복 검사하므로, 같은 spec에 대한
+        판정 결과를 경로별로 기억해 두고 재사용합니다 (PathSpec은 패턴 수만큼 정규식을 검사).
+        """
         if not spec:
             return False
+
+        cached_spec, memo = self._ignore_match_cache
+        if cached_spec is not spec or len(memo) > 100_000:
+            memo = {}
+            self._ignore_match_cache = (spec, memo)
+        key = str(path)
+        hit = memo.get(key)
+        if hit is not None:
+            return hit
         
         try:
             relative_path_str = path.relative_to(self.BASE_DIR).as_posix()
         except ValueError:
             # BASE_DIR 외부에 있는 경로는 무시 규칙의 대상이 아님
+            memo[key] = False
             return False
 
-        if path.is_dir() and not relative_path_str.endswith('/'):
+        if is_dir is None:
+            is_dir = path.is_dir()
+        if is_dir and not relative_path_str.endswith('/'):
             relative_path_str += '/'
             
-        return spec.match_file(relative_path_str)
+        result = spec.match_file(relative_path_str)
+        memo[key] = result
+        return result
 
     @staticmethod
     def read_plain_file(path: Path) -> str:
-        try:
-            return path.read_text(encoding="utf-8", errors="ignore")
-        except Exception as e:
-            return f"[파일 읽기 실패: {e}]"
+        return Utils._read_plain_file(path)
 
     @staticmethod
     def encode_base64(path: Path) -> str:
-        return base64.b64encode(path.read_bytes()).decode("utf-8")
+        return Utils._encode_base64(path)
+
+    def _max_code_block_suffix(self, prefix: str, suffix: str) -> int:
+        """CODE_OUTPUT_DIR에서 '{prefix}{번호}{suffix}' 형태 파일의 가장 큰 번호를 반환합니다. 없으면 0."""
+        highest = 0
+        with os.scandir(self.CODE_OUTPUT_DIR) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith(prefix) and name.endswith(suffix):
+                    num = name[len(prefix):len(name) - len(suffix)]
+                    if num.isdigit():
+                        highest = max(highest, int(num))
+        return highest
 
     def save_code_blocks(self, blocks: Sequence[Tuple[str, str]], session_name: str, msg_id: int) -> List[Path]:
-        """AI가 생성한 코드 블록을 파일로 저장합니다."""
-        self.CODE_OUTPUT_DIR.mkdir(exist_ok=True)
+        """
+        AI가 생성한 코드 블록을 파일로 저장합니다.
+        출력 디렉터리는 초기화 시 생성되므로, 사라진 경우에만 다시 만듭니다.
+        """
         saved: List[Path] = []
-        ext_map = {
-            # 스크립팅 & 프로그래밍 언어
-            "python": "py", "py": "py",
-            "javascript": "js", "js": "js",
-            "typescript": "ts", "ts": "ts",
-            "bash": "sh", "sh": "sh", "shell": "sh",
-            "java": "java",
-            "c": "c",
-            "cpp": "cpp", "c++": "cpp",
-            "go": "go",
-            "rust": "rs", "rs": "rs",
-            "ruby": "rb", "rb": "rb",
-            "php": "php",
-            "sql": "sql",
-            
-            # 마크업 & 데이터 형식
-            "html": "html",
-            "css": "css",
-            "scss": "scss",
-            "json": "json",
-            "xml": "xml",
-            "yaml": "yml", "yml": "yml",
-            "markdown": "md", "md": "md",
-            
-            # 기타
-            "text": "txt", "plaintext": "txt",
-            "diff": "diff",
-        }
-        
+
         for i, (lang, code) in enumerate(blocks, 1):
-            ext = ext_map.get(lang.lower() if lang else "text", "txt")
-            
-            # 기본 파일 경로 생성
-            base_p = self.CODE_OUTPUT_DIR / f"codeblock_{session_name}_{msg_id}_{i}.{ext}"
-            p = base_p
-            
-            # 파일이 이미 존재하면 이름에 숫자 추가
-            cnt = 1
-            while p.exists():
-                p = self.CODE_OUTPUT_DIR / f"codeblock_{session_name}_{msg_id}_{i}_{cnt}.{ext}"
-                cnt += 1
+            ext = self._CODE_BLOCK_EXTS.get(lang.lower() if lang else "text", "txt")
             
-            p.write_text(code, encoding="utf-8")
+            # 기본 이름을 배타적 생성(O_EXCL)으로 바로 시도하고, 이미 있으면
+            # 디렉터리를 한 번만 훑어 다음 번호를 정합니다 (번호마다 exists() 반복 X).
+            stem = f"codeblock_{session_name}_{msg_id}_{i}"
+            p = self.CODE_OUTPUT_DIR / f"{stem}.{ext}"
+            data = code.encode("utf-8")
+            cnt = 0
+            while True:
+                try:
+                    with p.open("xb") as f:
+                        f.write(data)
+                    break
+                except FileNotFoundError:
+                    self.CODE_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+                except FileExistsError:
+                    cnt = max(cnt, self._max_code_block_suffix(f"{stem}_", f".{ext}")) + 1
+                    p = self.CODE_OUTPUT_DIR / f"{stem}_{cnt}.{ext}"
             saved.append(p)
         return saved
@@ -7,6 +7,9 @@ from rich.console import Console
 from src.gptcli.services.config import ConfigManager
 from src.gptcli.utils.common import Utils
 
+# 슬러그 치환: 허용 문자([A-Za-z0-9._-]) 밖의 문자와 '_'의 연속을 '_' 하나로 (한 번의 패스)
+_SLUG_RE = re.compile(r"[^A-Za-z0-9.-]+")
+
 class SessionService:
     """
     세션 스냅샷/복원/삭제 + 코드 스냅샷 관리 전담 서비스.
@@ -43,8 +46,7 @@ class SessionService:
         파일/디렉터리 안전 슬러그. 대소문자 유지, [A-Za-z0-9._-] 외는 '_'로 치환.
         브라우저 생태계에서도 세션명과 파일명이 다를 수 있음을 감안(특수문자) [forum.vivaldi.net].
         """
-        s = re.sub(r"[^A-Za-z0-9._-]+", "_", session_name.strip())
-        s = re.sub(r"_+", "_", s).strip("._-")
+        s = _SLUG_RE.sub("_", session_name.strip()).strip("._-")
         return s or "default"
 
     def _single_backup_json(self, session_name: str) -> Path:
@@ -70,6 +72,9 @@ class SessionService:
         """
         path = self.config.get_session_path(session_name)
         try:
+            # 아직 전체 JSON에 합쳐지지 않은 턴 로그도 함께 정리 (대기 중인 로그 쓰기를 먼저 끝냄)
+            self.config.flush_writes()
+            self.config.get_session_journal_path(session_name).unlink(missing_ok=True)
             if path.exists():
                 path.unlink()
                 self.console.print(
@@ -162,6 +162,8 @@ class SummarizationService:
         """
         from src.gptcli.utils.common import Utils
 
+        # 매 턴 전체 메시지를 세므로, 아직 세지 않은 긴 텍스트는 한 번에 일괄 토큰화
+        self.token_estimator.warm_token_cache(Utils._iter_message_texts(messages))
         used = sum(
             Utils._count_message_tokens_with_estimator(m, self.token_estimator)
             for m in messages
@@ -360,7 +362,7 @@ class SummarizationService:
         original_tokens: int
     ) -> Optional[Tuple[str, int, int]]:
         """
-        메시지를 청크로 분할하여 순차적으로 요약합니다.
+        메시지를 청크로 분할하여 요약합니다. 청크끼리는 서로 독립이므로 동시에 요청합니다.
 
         각 청크를 개별 요약 → 중간 요약들을 최종 통합 요약
         """
@@ -392,39 +394,39 @@ class SummarizationService:
             highlight=False
         )
 
-        # 2. 각 청크 요약
-        chunk_summaries: List[str] = []
+        # 2. 각 청크 요약 (병렬 요청)
+        requests: List[List[Dict[str, Any]]] = []
         for i, chunk in enumerate(chunks, 1):
             chunk_tokens = sum(
                 Utils._count_message_tokens_with_estimator(m, self.token_estimator)
                 for m in chunk
             )
             self.console.print(
-                f"[dim]  청크 {i}/{len(chunks)} 요약 중... ({len(chunk)}개, ~{chunk_tokens:,}tk)[/dim]",
+                f"[dim]  청크 {i}/{len(chunks)} 요약 요청 ({len(chunk)}개, ~{chunk_tokens:,}tk)[/dim]",
                 highlight=False
             )
-
             formatted = self._format_messages_for_prompt(chunk)
+            requests.append([{
+                "role": "user",
+                "content": f"다음 대화를 요약해주세요:\n\n{formatted}"
+            }])
 
-            try:
-                result = self.parser.stream_and_parse(
-                    system_prompt={"role": "system", "content": self.SUMMARY_SYSTEM_PROMPT},
-                    final_messages=[{
-                        "role": "user",
-                        "content": f"다음 대화를 요약해주세요:\n\n{formatted}"
-                    }],
-                    model=model,
-                    pretty_print=False,
-                    tools=None
-                )
-
-                if result and result[0]:
-                    chunk_summaries.append(f"[파트 {i}]\n{result[0]}")
-                else:
-                    self.console.print(f"[yellow]청크 {i} 요약 실패, 건너뜀[/yellow]", highlight=False)
+        try:
+            results = self.parser.complete_many(
+                system_prompt={"role": "system", "content": self.SUMMARY_SYSTEM_PROMPT},
+                requests=requests,
+                model=model,
+            )
+        except Exception as e:
+            self.console.print(f"[yellow]청크 요약 오류: {e}[/yellow]", highlight=False)
+            results = [None] * len(requests)
 
-            except Exception as e:
-                self.console.print(f"[yellow]청크 {i} 오류: {e}[/yellow]", highlight=False)
+        chunk_summaries: List[str] = []
+        for i, text in enumerate(results, 1):
+            if text:
+                chunk_summaries.append(f"[파트 {i}]\n{text}")
+            else:
+                self.console.print(f"[yellow]청크 {i} 요약 실패, 건너뜀[/yellow]", highlight=False)
 
         if not chunk_summaries:
             self.console.print("[red]모든 청크 요약 실패[/red]", highlight=False)
@@ -1,9 +1,12 @@
 # src/gptcli/services/theme.py
 from __future__ import annotations
-import urwid
-from typing import Dict, Tuple, List, Optional
+from typing import Dict, Tuple, List, Optional, TYPE_CHECKING
 from rich.theme import Theme
 import src.constants as constants
+
+if TYPE_CHECKING:
+    # urwid는 TUI(AttrSpec 생성)를 처음 쓸 때 불러옵니다 (시작 시간 절약).
+    import urwid
         
 class ThemeManager:
     """
@@ -89,6 +92,7 @@ class ThemeManager:
 
     def _mk_attr(self, fg: str, bg: str, fb_bg: str = 'default') -> urwid.AttrSpec:
         """색상 문자열로 urwid.AttrSpec 객체를 생성합니다."""
+        import urwid
         fg_norm = self._normalize_color_spec(fg) if fg else fg
         bg_norm = self._normalize_color_spec(bg) if bg else bg
         try:
@@ -1,13 +1,32 @@
 from __future__ import annotations
-import io, math, base64
+import io, math, base64, os
+from functools import lru_cache
 from pathlib import Path
-from typing import Union
-from PIL import Image
-import PyPDF2
-import tiktoken
+from typing import Dict, Iterable, Tuple, Union
 from rich.console import Console
 #import src.constants as constants
 
+
+@lru_cache(maxsize=512)
+def _image_tile_tokens(width: int, height: int) -> int:
+    """
+    high detail 이미지의 보정 전 토큰 수 (OpenAI 타일 방식).
+    같은 첨부 이미지가 턴마다 같은 크기로 다시 계산되므로 (가로, 세로)별로 캐시합니다.
+    """
+    if width > 2048 or height > 2048:
+        r = min(2048 / width, 2048 / height)
+        width, height = int(width * r), int(height * r)
+    if min(width, height) > 768:
+        if width < height:
+            height = int(height * 768 / width)
+            width = 768
+        else:
+            width = int(width * 768 / height)
+            height = 768
+    tiles_x = math.ceil(width / 512)
+    tiles_y = math.ceil(height / 512)
+    return 85 + 170 * (tiles_x * tiles_y)
+
 class TokenEstimator:
     """
     토큰 수 추정기.
@@ -34,11 +53,29 @@ class TokenEstimator:
     # OpenAI 공식 문서: 약 4-7 토큰/메시지, 하지만 실제로는 더 클 수 있음
     MESSAGE_OVERHEAD = 20
 
+    # 매 턴 다시 세는 긴 텍스트(첨부 파일 본문, 이전 대화 등)만 토큰 수를 캐시
+    TOKEN_CACHE_MIN_LEN = 256
+    TOKEN_CACHE_MAX_ENTRIES = 1024
+
+    # 이보다 큰 PDF는 페이지를 파싱하지 않고 파일 크기로 추정 (어차피 한도에 크게 영향을 주는 크기)
+    PDF_PARSE_MAX_BYTES = 2_000_000
+
+    # base64 이미지 크기 판정 시 먼저 디코드해 볼 앞부분 길이 (4의 배수, 디코드 후 48KB).
+    # PNG/GIF/WebP/BMP와 대부분의 JPEG는 이 안에 가로/세로 정보가 있음
+    IMAGE_HEADER_B64_CHARS = 65536
+    IMAGE_SIZE_CACHE_MAX_ENTRIES = 64
+
     def __init__(self, console: Console, model: str = "gpt-4"):
         self.console = console
         self.model = model
+        # 텍스트 → 보정 배수 적용 전 토큰 수. 인코더는 모델과 무관하게 같으므로 모델을 바꿔도 유지
+        self._token_cache: Dict[str, int] = {}
+        # base64 이미지 → (가로, 세로). 트리밍마다 같은 첨부 이미지를 다시 디코드하지 않도록 보관
+        self._image_size_cache: Dict[str, Tuple[int, int]] = {}
         self._vendor = "openai"
         self._multiplier = self.DEFAULT_MULTIPLIER
+        # tiktoken 인코더는 처음 토큰을 셀 때 생성 (import와 BPE 로딩이 시작 시간을 잡아먹지 않도록)
+        self._encoder = None
         self._init_encoder(model)
 
     def _init_encoder(self, model: str) -> None:
@@ -60,39 +97,81 @@ class TokenEstimator:
         if self._multiplier != 1.0:
             self.console.print(f"[dim]{self._vendor} 모델: 토큰 보정 {self._multiplier}x[/dim]", highlight=False)
 
-        # tiktoken 인코더
-        try:
-            self.encoder = tiktoken.encoding_for_model("gpt-4")
-        except KeyError:
-            self.encoder = tiktoken.get_encoding("cl100k_base")
+    @property
+    def encoder(self):
+        if self._encoder is None:
+            import tiktoken
+            try:
+                self._encoder = tiktoken.encoding_for_model("gpt-4")
+            except KeyError:
+                self._encoder = tiktoken.get_encoding("cl100k_base")
+        return self._encoder
 
     def update_model(self, model: str) -> None:
         if model != self.model:
             self._init_encoder(model)
 
+    def _base_token_count(self, text: str) -> int:
+        # warm_token_cache(encode_ordinary_batch)와 같은 규칙으로 셈: '<|endoftext|>' 같은 특수 토큰 문자열도
+        # 일반 텍스트로 취급 (encode()는 이런 텍스트에서 예외를 내고, 캐시 선채움 여부에 따라 결과가 달라짐)
+        if len(text) < self.TOKEN_CACHE_MIN_LEN:
+            return len(self.encoder.encode_ordinary(text))
+        # 메시지 문자열은 턴마다 같은 객체가 다시 들어오므로 해시도 한 번만 계산됨
+        cached = self._token_cache.get(text)
+        if cached is None:
+            cached = len(self.encoder.encode_ordinary(text))
+            self._store_token_count(text, cached)
+        return cached
+
+    def _store_token_count(self, text: str, count: int) -> None:
+        if len(self._token_cache) >= self.TOKEN_CACHE_MAX_ENTRIES:
+            # 가장 먼저 들어온 항목부터 제거 (dict는 삽입 순서 유지)
+            del self._token_cache[next(iter(self._token_cache))]
+        self._token_cache[text] = count
+
+    def warm_token_cache(self, texts: Iterable[str]) -> None:
+        """
+        여러 텍스트의 토큰 수를 미리 캐시에 채웁니다.
+        캐시에 없는 긴 텍스트만 모아 encode_ordinary_batch로 한 번에 토큰화합니다
+        (tiktoken이 GIL을 놓고 스레드로 나눠 처리). 이후 count_text_tokens는 캐시에서 바로 반환합니다.
+        """
+        cache = self._token_cache
+        pending = [
+            t for t in dict.fromkeys(texts)
+            if len(t) >= self.TOKEN_CACHE_MIN_LEN and t not in cache
+        ][:self.TOKEN_CACHE_MAX_ENTRIES]
+        if not pending:
+            return
+        num_threads = min(8, os.cpu_count() or 1, len(pending))
+        for text, tokens in zip(pending, self.encoder.encode_ordinary_batch(pending, num_threads=num_threads)):
+            self._store_token_count(text, len(tokens))
+
     def count_text_tokens(self, text: str) -> int:
-        """텍스트의 토큰 수를 추정합니다."""
-        base_tokens = len(self.encoder.encode(text))
-        return int(base_tokens * self._multiplier)
+        """텍스트의 토큰 수를 추정합니다. 긴 텍스트는 한 번만 토큰화합니다."""
+        return int(self._base_token_count(text) * self._multiplier)
 
     def calculate_image_tokens(self, width: int, height: int, detail: str = "auto") -> int:
         """이미지 토큰 수를 계산합니다 (OpenAI 방식)."""
         if detail == "low":
             return 85
-        if width > 2048 or height > 2048:
-            r = min(2048 / width, 2048 / height)
-            width, height = int(width * r), int(height * r)
-        if min(width, height) > 768:
-            if width < height:
-                height = int(height * 768 / width)
-                width = 768
-            else:
-                width = int(width * 768 / height)
-                height = 768
-        tiles_x = math.ceil(width / 512)
-        tiles_y = math.ceil(height / 512)
-        base = 85 + 170 * (tiles_x * tiles_y)
-        return int(base * self._multiplier)
+        return int(_image_tile_tokens(width, height) * self._multiplier)
+
+    def _base64_image_size(self, b64: str) -> Tuple[int, int]:
+        size = self._image_size_cache.get(b64)
+        if size is not None:
+            return size
+        from PIL import Image
+        try:
+            # 헤더만 있으면 크기를 알 수 있으므로 앞부분만 디코드 (Image.open은 픽셀을 읽지 않음)
+            with Image.open(io.BytesIO(base64.b64decode(b64[:self.IMAGE_HEADER_B64_CHARS]))) as img:
+                size = img.size
+        except Exception:
+            with Image.open(io.BytesIO(base64.b64decode(b64))) as img:
+                size = img.size
+        if len(self._image_size_cache) >= self.IMAGE_SIZE_CACHE_MAX_ENTRIES:
+            del self._image_size_cache[next(iter(self._image_size_cache))]
+        self._image_size_cache[b64] = size
+        return size
 
     def estimate_image_tokens(self, image_input: Union[Path, str], detail: str = "auto") -> int:
         """이미지의 토큰 수를 추정합니다."""
@@ -102,9 +181,7 @@ class TokenEstimator:
                 try:
                     if image_input.startswith('data:'):
                         image_input = image_input.split(',', 1)[1]
-                    image_data = base64.b64decode(image_input)
-                    img = Image.open(io.BytesIO(image_data))
-                    width, height = img.size
+                    width, height = self._base64_image_size(image_input)
                     if detail == "auto":
                         detail = "high"
                     return self.calculate_image_tokens(width, height, detail)
@@ -130,6 +207,26 @@ class TokenEstimator:
 
     def estimate_pdf_tokens(self, pdf_path: Path) -> int:
         """PDF 파일의 토큰 수를 추정합니다."""
+        file_size = pdf_path.stat().st_size
+        if file_size > self.PDF_PARSE_MAX_BYTES:
+            self.console.print(
+                f"[dim]큰 PDF({file_size / (1024 * 1024):.1f}MB): 페이지 파싱 없이 파일 크기로 추정합니다.[/dim]",
+                highlight=False,
+            )
+            return int(int(file_size / 1024 * 3) * self._multiplier)
+
+        try:
+            # PyMuPDF: C 엔진이라 PyPDF2보다 텍스트 추출이 훨씬 빠름 (설치된 경우에만, PDF를 셀 때 처음 임포트)
+            import fitz
+        except ImportError:
+            fitz = None
+        if fitz is not None:
+            try:
+                with fitz.open(pdf_path) as doc:
+                    text = "".join(page.get_text() for page in doc)
+                return self.count_text_tokens(text)
+            except Exception:
+                pass  # PyMuPDF가 열지 못하는 파일은 아래 PyPDF2 경로로 다시 시도
         try:
             import PyPDF2
             with open(pdf_path, 'rb') as file:
@@ -137,9 +234,9 @@ class TokenEstimator:
                 text = "".join(page.extract_text() or "" for page in reader.pages)
                 return self.count_text_tokens(text)
         except ImportError:
-            file_size_kb = pdf_path.stat().st_size / 1024
-            base = int(file_size_kb * 3)
+            base = int(file_size / 1024 * 3)
             return int(base * self._multiplier)
         except Exception:
-            tokens = len(base64.b64encode(pdf_path.read_bytes())) // 4
+            # base64 길이 / 4 == ceil(n / 3): 실제로 인코딩하지 않고 파일 크기로 계산
+            tokens = (file_size + 2) // 3
             return int(tokens * self._multiplier)
@@ -170,8 +170,10 @@ class ToolLoopService:
             이는 Anthropic API의 tool_use/tool_result 페어링 요구사항을 충족시키기 위함입니다.
         """
         # 모델 Tool 지원 여부 확인
-        tools, tool_choice = self.get_tools_for_api(model)
-        has_support, params = self.check_model_tool_support(model)
+        # 첫 확인 시 OpenRouter 모델 목록을 내려받으므로(최대 10초) 스피너로 대기 상태를 표시합니다.
+        with self.console.status("[cyan]모델 기능 확인 중...", spinner="dots"):
+            tools, tool_choice = self.get_tools_for_api(model)
+            has_support, params = self.check_model_tool_support(model)
 
         # 디버그: 모델의 Tool 지원 상태 출력
         model_short = model.split("/")[-1] if "/" in model else model
@@ -174,21 +174,23 @@ class ToolExecutor:
 
             content = path.read_text(encoding="utf-8")
 
-            # 매칭 횟수 확인
-            count = content.count(old_string)
+            # 매칭 위치 확인: 첫 위치와 (겹치지 않는) 두 번째 위치만 찾으면 유일성 판정 가능
+            idx = content.find(old_string)
 
-            if count == 0:
+            if idx == -1:
                 return False, f"오류: 지정한 문자열을 찾을 수 없습니다.\n검색 문자열:\n{old_string[:200]}..."
 
-            if count > 1:
+            end = idx + len(old_string)
+            if end < len(content) and content.find(old_string, end) != -1:
+                count = content.count(old_string)  # 오류 메시지용 (실패 경로에서만 전체 계수)
                 return False, (
                     f"오류: 문자열이 {count}번 발견되었습니다. "
                     f"유일한 문자열을 지정해야 합니다.\n"
                     f"더 많은 컨텍스트를 포함하여 유일하게 만들어 주세요."
                 )
 
-            # 치환 수행
-            new_content = content.replace(old_string, new_string, 1)
+            # 치환 수행 (찾은 위치로 바로 이어 붙여 재검색 없이)
+            new_content = content[:idx] + new_string + content[end:]
             path.write_text(new_content, encoding="utf-8")
 
             # 변경 통계
@@ -11,7 +11,6 @@ TrustLevel:
 """
 from __future__ import annotations
 
-import difflib
 import re
 from enum import Enum
 from pathlib import Path
@@ -58,6 +57,13 @@ DANGEROUS_PATTERNS: List[str] = [
     r"\bgit\s+reset\s+--hard\s+HEAD~",   # 위험한 git reset
 ]
 
+# 패턴마다 명령을 다시 훑지 않도록 하나의 alternation으로 합쳐 한 번만 검사
+_DANGEROUS_RE = re.compile("|".join(f"(?:{p})" for p in DANGEROUS_PATTERNS), re.IGNORECASE)
+
+# 위 패턴이 매치되려면 반드시 포함해야 하는 리터럴 (소문자). 하나도 없으면 정규식 검사를 생략
+# 패턴을 추가할 때는 그 패턴의 필수 리터럴도 여기에 함께 추가해야 합니다.
+_DANGEROUS_KEYWORDS: Tuple[str, ...] = ("rm", "mkfs", "dd", ">", "chmod", "chown", ":(", "git")
+
 
 class PermissionManager:
     """
@@ -67,10 +73,21 @@ class PermissionManager:
     위험한 명령에 대해서는 항상 사용자 확인을 요청합니다.
     """
 
+    # 확장자 → Syntax 언어 (미리보기마다 dict를 다시 만들지 않도록 클래스 상수로 둠)
+    _EXT_LANGUAGES: Dict[str, str] = {
+        ".py": "python", ".js": "javascript", ".ts": "typescript",
+        ".tsx": "tsx", ".jsx": "jsx", ".java": "java",
+        ".c": "c", ".cpp": "cpp", ".h": "c", ".hpp": "cpp",
+        ".go": "go", ".rs": "rust", ".rb": "ruby",
+        ".php": "php", ".sh": "bash", ".bash": "bash",
+        ".json": "json", ".yaml": "yaml", ".yml": "yaml",
+        ".html": "html", ".css": "css", ".scss": "scss",
+        ".sql": "sql", ".md": "markdown", ".xml": "xml",
+    }
+
     def __init__(self, console: Console, trust_level: TrustLevel = TrustLevel.FULL):
         self.console = console
         self.trust_level = trust_level
-        self._compiled_dangerous = [re.compile(p, re.IGNORECASE) for p in DANGEROUS_PATTERNS]
 
     def set_trust_level(self, level: TrustLevel) -> None:
         """신뢰 수준을 변경합니다."""
@@ -82,10 +99,10 @@ class PermissionManager:
 
     def is_dangerous_command(self, command: str) -> bool:
         """명령이 위험한 패턴에 해당하는지 확인합니다."""
-        for pattern in self._compiled_dangerous:
-            if pattern.search(command):
-                return True
-        return False
+        lowered = command.lower()
+        if not any(k in lowered for k in _DANGEROUS_KEYWORDS):
+            return False
+        return _DANGEROUS_RE.search(command) is not None
 
     def check_permission(
         self,
@@ -186,6 +203,7 @@ class PermissionManager:
         if new_lines_list and not new_lines_list[-1].endswith('\n'):
             new_lines_list[-1] += '\n'
 
+        import difflib  # Edit 확인 화면에서만 필요
         diff_lines = list(difflib.unified_diff(
             old_lines_list,
             new_lines_list,
@@ -221,36 +239,31 @@ class PermissionManager:
         - ' ' 컨텍스트 라인: 기본색 + syntax highlighting
         """
         result = Text()
-        line_count = 0
         total_lines = len(diff_lines)
 
         # 언어 추론 및 렉서 획득
         lexer = self._get_lexer_for_file(file_path)
 
-        for i, line in enumerate(diff_lines):
-            if line_count >= max_lines and i < total_lines - 3:
-                # 생략 표시 후 마지막 3줄은 보여줌
-                omitted = total_lines - i - 3
-                if omitted > 0:
-                    result.append(f"\n    ... ⋮ {omitted}줄 생략 ⋮ ...\n", style="dim italic")
-                    # 마지막 3줄로 점프
-                    for last_line in diff_lines[-3:]:
-                        self._append_diff_line_highlighted(result, last_line, lexer)
-                    break
-
-            self._append_diff_line_highlighted(result, line, lexer)
-            line_count += 1
+        if total_lines <= max_lines + 3:
+            self._append_diff_lines_highlighted(result, diff_lines, lexer)
+            return result
 
+        # 앞쪽 max_lines줄 + 생략 표시 + 마지막 3줄
+        self._append_diff_lines_highlighted(result, diff_lines[:max_lines], lexer)
+        omitted = total_lines - max_lines - 3
+        result.append(f"\n    ... ⋮ {omitted}줄 생략 ⋮ ...\n", style="dim italic")
+        self._append_diff_lines_highlighted(result, diff_lines[-3:], lexer)
         return result
 
     def _get_lexer_for_file(self, file_path: str):
         """파일 경로에서 적절한 Pygments 렉서를 반환합니다."""
+        # 여러 줄을 한 번에 렉싱하므로 앞뒤 빈 줄이 제거되지 않도록 stripnl=False
         if not file_path:
-            return TextLexer()
+            return TextLexer(stripnl=False)
         try:
-            return guess_lexer_for_filename(file_path, "")
+            return guess_lexer_for_filename(file_path, "", stripnl=False)
         except Exception:
-            return TextLexer()
+            return TextLexer(stripnl=False)
 
     # Pygments 토큰 → Rich 색상 매핑 (monokai 테마 기반)
     _TOKEN_COLORS: Dict[str, str] = {
@@ -284,64 +297,92 @@ class PermissionManager:
 
         return "#f8f8f2"  # 기본 흰색
 
-    def _append_diff_line_highlighted(self, text: Text, line: str, lexer) -> None:
-        """개별 diff 라인을 syntax highlighting과 함께 Text 객체에 추가합니다."""
-        line = line.rstrip('\n')
-
-        if line.startswith('---'):
-            text.append(line + "\n", style="bold red")
-        elif line.startswith('+++'):
-            text.append(line + "\n", style="bold green")
-        elif line.startswith('@@'):
-            text.append(line + "\n", style="bold cyan")
-        elif line.startswith('-'):
-            # 삭제 라인: 빨간 배경 + syntax highlighting
-            self._append_code_with_bg(text, "-", line[1:], "#5f0000", lexer)
-        elif line.startswith('+'):
-            # 추가 라인: 초록 배경 + syntax highlighting
-            self._append_code_with_bg(text, "+", line[1:], "#005f00", lexer)
-        else:
-            # 컨텍스트 라인
-            code = line[1:] if line.startswith(' ') else line
-            self._append_code_with_bg(text, " ", code, "#1e1e1e", lexer, dim=True)
+    # diff 부호별 (배경색, 흐리게 표시 여부)
+    _DIFF_LINE_STYLES: Dict[str, Tuple[str, bool]] = {
+        "-": ("#5f0000", False),  # 삭제 라인: 빨간 배경
+        "+": ("#005f00", False),  # 추가 라인: 초록 배경
+        " ": ("#1e1e1e", True),   # 컨텍스트 라인
+    }
 
-    def _append_code_with_bg(
+    def _append_diff_lines_highlighted(self, text: Text, lines: List[str], lexer) -> None:
+        """
+        diff 라인들을 syntax highlighting과 함께 Text 객체에 추가합니다.
+        같은 부호(-, +, 컨텍스트)가 연속된 구간은 한 번에 렉싱합니다.
+        """
+        run_prefix: Optional[str] = None
+        run_codes: List[str] = []
+
+        def flush() -> None:
+            if run_codes:
+                bg_color, dim = self._DIFF_LINE_STYLES[run_prefix]
+                self._append_code_block_with_bg(text, run_prefix, run_codes, bg_color, lexer, dim=dim)
+                run_codes.clear()
+
+        for line in lines:
+            line = line.rstrip('\n')
+
+            if line.startswith(('---', '+++', '@@')):
+                flush()
+                run_prefix = None
+                if line.startswith('---'):
+                    text.append(line + "\n", style="bold red")
+                elif line.startswith('+++'):
+                    text.append(line + "\n", style="bold green")
+                else:
+                    text.append(line + "\n", style="bold cyan")
+                continue
+
+            if line.startswith(('-', '+')):
+                prefix, code = line[0], line[1:]
+            else:
+                prefix, code = " ", (line[1:] if line.startswith(' ') else line)
+
+            if prefix != run_prefix:
+                flush()
+                run_prefix = prefix
+            run_codes.append(code)
+
+        flush()
+
+    def _append_code_block_with_bg(
         self,
         text: Text,
         prefix: str,
-        code: str,
+        codes: List[str],
         bg_color: str,
         lexer,
         dim: bool = False
     ) -> None:
-        """코드를 syntax highlighting과 배경색과 함께 추가합니다."""
-        # prefix (-, +, 공백)
+        """연속된 코드 라인들을 한 번 렉싱하여 줄마다 prefix·배경색과 함께 추가합니다."""
         prefix_style = f"bold on {bg_color}" if prefix != " " else f"dim on {bg_color}"
-        text.append(prefix, style=prefix_style)
+        line_end_style = f"on {bg_color}"
 
-        if not code:
-            text.append("\n", style=f"on {bg_color}")
-            return
+        # 렉서가 \r을 줄바꿈으로 바꾸므로 미리 제거해 줄 수를 유지
+        codes = [c.replace('\r', '') if '\r' in c else c for c in codes]
 
-        # 코드 토큰화 및 렌더링
+        # 줄 단위 (스타일, 값) 목록으로 변환
+        rows: List[List[Tuple[str, str]]] = [[] for _ in codes]
         try:
-            tokens = list(pyg_lex(code, lexer))
-            for ttype, value in tokens:
-                if not value or value == '\n':
-                    continue
-                fg_color = self._get_token_color(ttype)
-                style = f"{fg_color} on {bg_color}"
-                if dim:
-                    style = f"dim {fg_color} on {bg_color}"
-                text.append(value, style=style)
+            row = 0
+            for ttype, value in pyg_lex("\n".join(codes), lexer):
+                pieces = value.split('\n')
+                for j, piece in enumerate(pieces):
+                    if j:
+                        row += 1
+                    if piece and row < len(rows):
+                        fg_color = self._get_token_color(ttype)
+                        style = f"dim {fg_color} on {bg_color}" if dim else f"{fg_color} on {bg_color}"
+                        rows[row].append((piece, style))
         except Exception:
             # 렉싱 실패 시 기본 스타일
-            style = f"on {bg_color}"
-            if dim:
-                style = f"dim on {bg_color}"
-            text.append(code, style=style)
+            style = f"dim on {bg_color}" if dim else f"on {bg_color}"
+            rows = [[(code, style)] if code else [] for code in codes]
 
-        text.append("\n", style=f"on {bg_color}")
+        for row_tokens in rows:
+            text.append(prefix, style=prefix_style)
+            for value, style in row_tokens:
+                text.append(value, style=style)
+            text.append("\n", style=line_end_style)
 
     def _find_line_number(self, file_path: str, search_str: str) -> int:
         """파일에서 문자열의 시작 줄 번호를 찾습니다."""
@@ -355,8 +396,8 @@ class PermissionManager:
             idx = content.find(search_str)
             if idx == -1:
                 return 0
-            # idx 위치까지의 줄바꿈 개수 + 1 = 줄 번호
-            return content[:idx].count("\n") + 1
+            # idx 위치까지의 줄바꿈 개수 + 1 = 줄 번호 (앞부분을 잘라 복사하지 않고 범위만 지정)
+            return content.count("\n", 0, idx) + 1
         except Exception:
             return 0
 
@@ -391,19 +432,9 @@ class PermissionManager:
 
     def _guess_language(self, file_path: str) -> str:
         """파일 경로에서 언어를 추론합니다."""
-        ext_map = {
-            ".py": "python", ".js": "javascript", ".ts": "typescript",
-            ".tsx": "tsx", ".jsx": "jsx", ".java": "java",
-            ".c": "c", ".cpp": "cpp", ".h": "c", ".hpp": "cpp",
-            ".go": "go", ".rs": "rust", ".rb": "ruby",
-            ".php": "php", ".sh": "bash", ".bash": "bash",
-            ".json": "json", ".yaml": "yaml", ".yml": "yaml",
-            ".html": "html", ".css": "css", ".scss": "scss",
-            ".sql": "sql", ".md": "markdown", ".xml": "xml",
-        }
         if file_path:
             ext = Path(file_path).suffix.lower()
-            return ext_map.get(ext, "text")
+            return self._EXT_LANGUAGES.get(ext, "text")
         return "text"
 
     def _smart_truncate(self, text: str, max_lines: int = 25) -> str:
@@ -1,21 +1,94 @@
 # src/gptcli/ui/completion.py
 from __future__ import annotations
-from typing import Optional, List
+import os
+from bisect import bisect_left
+from typing import Any, Dict, Optional, List, Tuple
 from pathlib import Path
 from prompt_toolkit.completion import Completer, WordCompleter, FuzzyCompleter, Completion
 from prompt_toolkit.document import Document
 from src.gptcli.services.config import ConfigManager
 from src.gptcli.services.theme import ThemeManager
 
+class CachedPathCompleter(Completer):
+    """
+    prompt_toolkit PathCompleter 대체용 경로 자동완성기.
+    complete_while_typing 환경에서 키 입력마다 os.listdir + isdir + ignore 검사를 반복하지 않도록,
+    디렉터리별 (mtime, ignore spec) 기준으로 정렬된 후보 목록을 캐시하고 bisect로 접두사 구간만 조회합니다.
+    """
+    def __init__(self, config: 'ConfigManager', expanduser: bool = True):
+        self.config = config
+        self.expanduser = expanduser
+        # 디렉터리 절대경로 → (mtime, spec, 정렬된 이름 목록, 디렉터리 여부 목록)
+        self._dir_cache: Dict[str, Tuple[float, Any, List[str], List[bool]]] = {}
+
+    def _list_dir(self, directory: Path) -> Tuple[List[str], List[bool]]:
+        key = str(directory)
+        try:
+            mtime = directory.stat().st_mtime
+        except OSError:
+            self._dir_cache.pop(key, None)
+            return [], []
+
+        spec = self.config.get_ignore_spec()
+        cached = self._dir_cache.get(key)
+        if cached and cached[0] == mtime and cached[1] is spec:
+            return cached[2], cached[3]
+
+        entries: List[Tuple[str, bool]] = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if self.config.is_ignored(Path(entry.path), spec, is_dir=is_dir):
+                        continue
+                    entries.append((entry.name, is_dir))
+        except OSError:
+            return [], []
+
+        entries.sort()
+        names = [n for n, _ in entries]
+        dirs = [d for _, d in entries]
+        self._dir_cache[key] = (mtime, spec, names, dirs)
+        return names, dirs
+
+    def get_completions(self, document: Document, complete_event):
+        text = document.text_before_cursor
+        if self.expanduser:
+            text = os.path.expanduser(text)
+
+        dirname, prefix = os.path.split(text)
+        directory = Path(dirname) if dirname else Path(".")
+        if not directory.is_absolute():
+            directory = self.config.BASE_DIR / directory
+
+        names, dirs = self._list_dir(directory)
+        i = bisect_left(names, prefix)
+        while i < len(names) and names[i].startswith(prefix):
+            name = names[i]
+            # PathCompleter와 같이 디렉터리 표시는 display에만 붙이고, 삽입되는 텍스트는 이름까지만
+            suffix = "/" if dirs[i] else ""
+            yield Completion(
+                text=name[len(prefix):],
+                start_position=0,
+                display=name + suffix,
+            )
+            i += 1
+
 class PathCompleterWrapper(Completer):
     """
     PathCompleter를 /files 명령어에 맞게 감싸는 최종 완성 버전.
     스페이스로 구분된 여러 파일 입력을 완벽하게 지원합니다.
     """
-    def __init__(self, command_prefix: str, path_completer: Completer, config: 'ConfigManager'):
+    def __init__(self, command_prefix: str, path_completer: Completer, config: 'ConfigManager',
+                 prefiltered: bool = False):
         self.command_prefix = command_prefix
         self.path_completer = path_completer
         self.config = config
+        # 내부 completer가 이미 ignore 규칙을 적용한 경우(CachedPathCompleter) 후처리 필터 생략
+        self.prefiltered = prefiltered
 
     def get_completions(self, document: Document, complete_event):
         # 1. 사용자가 "/files " 뒤에 있는지 확인합니다.
@@ -38,6 +111,10 @@ class PathCompleterWrapper(Completer):
             cursor_position=len(word_before_cursor)
         )
 
+        if self.prefiltered:
+            yield from self.path_completer.get_completions(doc_for_path, complete_event)
+            return
+
         # 5. PathCompleter 제안을 받아 '무시 규칙'으로 후처리 필터링합니다.
         #    여기서 핵심은 comp.text를 '현재 단어의 디렉터리 컨텍스트'에 맞춰 절대경로로 복원하는 것입니다.
         spec = self.config.get_ignore_spec()
@@ -81,17 +158,20 @@ class AttachedFileCompleter(Completer):
             return
 
         # 2. 첨부된 모든 경로 중에서, 현재 입력한 단어로 '시작하는' 경로를 모두 찾습니다.
-        for path in self.attached_paths:
-            if path.startswith(word_before_cursor):
-                # 3. 찾은 경로를 Completion 객체로 만들어 반환합니다.
-                #    start_position=-len(word_before_cursor) 는
-                #    '현재 입력 중인 단어 전체를 이 completion으로 교체하라'는 의미입니다.
-                #    이것이 이 문제 해결의 핵심입니다.
-                yield Completion(
-                    path,
-                    start_position=-len(word_before_cursor),
-                    display_meta="[첨부됨]"
-                )
+        #    일반 질문 입력 중 단어마다 호출되므로, 정렬된 목록에서 bisect로 접두사 구간만 훑습니다.
+        paths = self.attached_paths
+        i = bisect_left(paths, word_before_cursor)
+        while i < len(paths) and paths[i].startswith(word_before_cursor):
+            # 3. 찾은 경로를 Completion 객체로 만들어 반환합니다.
+            #    start_position=-len(word_before_cursor) 는
+            #    '현재 입력 중인 단어 전체를 이 completion으로 교체하라'는 의미입니다.
+            #    이것이 이 문제 해결의 핵심입니다.
+            yield Completion(
+                paths[i],
+                start_position=-len(word_before_cursor),
+                display_meta="[첨부됨]"
+            )
+            i += 1
 
 class ConditionalCompleter(Completer):
     """
@@ -116,8 +196,55 @@ class ConditionalCompleter(Completer):
             meta_dict={c.text: c.display_meta for c in self.modes_with_meta}
         )
         self.session_option_completer = WordCompleter(["-s", "--session"], ignore_case=True)
-    
+        self._mode_names = frozenset(c.text for c in self.modes_with_meta)
+        # (세션/백업 디렉터리 mtime_ns, 제외할 현재 세션) → 세션명 자동완성기
+        self._session_cache: Optional[Tuple[Tuple[int, int, Optional[str]], Completer]] = None
+        # 테마 목록은 고정이므로 /theme 자동완성을 처음 쓸 때 한 번만 만듦
+        self._theme_completer: Optional[Completer] = None
+        # 마지막으로 첨부 파일 완성기를 만든 (첨부 목록, base_dir). 프롬프트마다 같은 목록이면 재사용
+        self._attached_key: Optional[Tuple[Tuple[str, ...], Path]] = None
+
+    @staticmethod
+    def _dir_mtime_ns(path: Path) -> int:
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return 0
+
+    def _get_session_completer(self) -> Completer:
+        """
+        세션명 자동완성기를 반환합니다.
+        키 입력마다 glob + 백업 JSON 읽기 + 완성기 생성을 반복하지 않도록,
+        세션/백업 디렉터리의 mtime이 바뀌었거나 현재 세션이 달라졌을 때만 다시 만듭니다.
+        """
+        current = getattr(self.app, "current_session_name", None)
+        key = (
+            self._dir_mtime_ns(Path(self.config.SESSION_DIR)),
+            self._dir_mtime_ns(self.config._backup_root_dir()),
+            current,
+        )
+        if self._session_cache is None or self._session_cache[0] != key:
+            session_names = self.config.get_session_names(include_backups=True, exclude_current=current)
+            completer = FuzzyCompleter(WordCompleter(session_names, ignore_case=True))
+            self._session_cache = (key, completer)
+        return self._session_cache[1]
+
+    def _get_theme_completer(self) -> Completer:
+        """테마명 자동완성기를 반환합니다. 키 입력마다 FuzzyCompleter/WordCompleter를 새로 만들지 않습니다."""
+        if self._theme_completer is None:
+            theme_names = self.theme_manager.get_available_themes()
+            self._theme_completer = FuzzyCompleter(
+                WordCompleter(theme_names, ignore_case=True,
+                              meta_dict={name: "코드 하이라이트 테마" for name in theme_names})
+            )
+        return self._theme_completer
+
     def update_attached_file_completer(self, attached_filenames: List[str], base_dir: Path):
+        # 프롬프트마다 호출되므로, 첨부 목록이 바뀌지 않았다면 Path 변환/정렬을 다시 하지 않음
+        key = (tuple(attached_filenames), base_dir)
+        if key == self._attached_key:
+            return
+        self._attached_key = key
         if attached_filenames:
             try:
                 # 1. 자동완성 후보가 될 상대 경로 리스트를 생성합니다.
@@ -146,37 +273,29 @@ class ConditionalCompleter(Completer):
     def get_completions(self, document: Document, complete_event):
         text = document.text_before_cursor
         stripped_text = text.lstrip()
-        
+        # 키 입력마다 접두사를 여러 번 비교하지 않도록 첫 토큰을 한 번만 잘라 분기
+        cmd, sep, _ = stripped_text.partition(' ')
 
         # mode 선택
 
-        if stripped_text.startswith('/theme'):
+        if cmd == '/theme':
             words = stripped_text.split()
             # "/theme" 또는 "/theme v" 처럼 테마명 입력 중
             if len(words) <= 1 or (len(words) == 2 and not text.endswith(' ')):
                 # 테마 목록 자동완성
                 if self.theme_manager:
-                    theme_names = self.theme_manager.get_available_themes()
-                    theme_completer = FuzzyCompleter(
-                        WordCompleter(theme_names, ignore_case=True, 
-                                    meta_dict={name: "코드 하이라이트 테마" for name in theme_names})
-                    )
-                    yield from theme_completer.get_completions(document, complete_event)
+                    yield from self._get_theme_completer().get_completions(document, complete_event)
                     return
                 
-        if stripped_text.startswith('/session'):
+        if cmd == '/session':
             words = stripped_text.split()
             # "/session" 또는 "/session <pa" 처럼 세션명 입력 중
             if len(words) <= 1 or (len(words) == 2 and not text.endswith(' ')):
                 if self.config:
-                    session_names = self.config.get_session_names(include_backups=True,exclude_current=getattr(self.app,"current_session_name",None))
-                    session_completer = FuzzyCompleter(
-                        WordCompleter(session_names, ignore_case=True)
-                    )
-                    yield from session_completer.get_completions(document, complete_event)
+                    yield from self._get_session_completer().get_completions(document, complete_event)
                     return
             
-        if stripped_text.startswith('/mode'):
+        if cmd == '/mode':
             words = stripped_text.split()
 
             # "/mode"만 있거나, "/mode d" 처럼 두 번째 단어 입력 중일 때
@@ -186,7 +305,7 @@ class ConditionalCompleter(Completer):
 
             # "/mode dev"가 입력되었고, 세 번째 단어("-s")를 입력할 차례일 때
             # IndexError 방지: len(words) >= 2 인 것이 확실한 상황
-            if len(words) == 2 and words[1] in ["dev", "general", "teacher"] and text.endswith(" "):
+            if len(words) == 2 and words[1] in self._mode_names and text.endswith(" "):
                 yield from self.session_option_completer.get_completions(document, complete_event)
                 return
 
@@ -195,11 +314,11 @@ class ConditionalCompleter(Completer):
             return
 
         # 경우 1: 경로 완성이 필요한 경우
-        if stripped_text.startswith('/files '):
+        if cmd == '/files' and sep:
             yield from self.file_completer.get_completions(document, complete_event)
 
         # 경우 2: 명령어 완성이 필요한 경우
-        elif stripped_text.startswith('/') and ' ' not in stripped_text:
+        elif not sep and cmd.startswith('/'):
             yield from self.command_completer.get_completions(document, complete_event)
 
         # 경우 3: 그 외 (일반 질문 시 '첨부 파일 이름' 완성 시도)
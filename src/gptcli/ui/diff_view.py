@@ -2,14 +2,18 @@
 from __future__ import annotations
 from typing import Any, Dict, List, Tuple, Optional, Set
 from pathlib import Path
-import urwid, difflib, threading, re
+import urwid, threading, re
 from pygments import lex as pyg_lex
 from pygments.lexers import guess_lexer_for_filename, TextLexer
 from rich.console import Console
 from src.gptcli.services.theme import ThemeManager
 from src.gptcli.services.config import ConfigManager
+from src.gptcli.utils.common import Utils
 import src.constants as constants
 
+# unified diff 헝크 헤더 (diff를 그릴 때마다 컴파일하지 않도록 모듈 로드 시 1회 컴파일)
+_HUNK_HEADER_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
 class DiffListBox(urwid.ListBox):
     """마우스 이벤트를 안전하게 처리하는 diff 전용 ListBox"""
     
@@ -756,13 +760,13 @@ class CodeDiffer:
         else:
             context_lines = self.context_lines
 
-        diff = list(difflib.unified_diff(
+        diff = Utils.unified_diff_lines(
             old_lines, new_lines,
             fromfile=f"a/{old_item['path'].name}",
             tofile=f"b/{new_item['path'].name}",
             lineterm='',
             n=context_lines
-        ))
+        )
         if not diff:
             self.footer.original_widget.set_text("두 파일이 동일합니다.")
             return
@@ -792,7 +796,6 @@ class CodeDiffer:
             # 헝크 파서
             old_ln = None
             new_ln = None
-            hunk_re = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
             
             i = 0
             while i < len(diff):
@@ -806,7 +809,7 @@ class CodeDiffer:
 
                 # 헝크 헤더
                 if line.startswith('@@'):
-                    m = hunk_re.match(line)
+                    m = _HUNK_HEADER_RE.match(line)
                     if m:
                         old_ln = int(m.group(1))
                         new_ln = int(m.group(3))
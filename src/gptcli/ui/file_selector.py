@@ -1,6 +1,7 @@
 # src/gptcli/ui/file_selector.py
 from __future__ import annotations
-from typing import List, Tuple, Set
+import os
+from typing import AbstractSet, Dict, FrozenSet, List, Optional, Tuple, Set
 from pathlib import Path
 import urwid
 from src.gptcli.services.config import ConfigManager
@@ -15,56 +16,95 @@ class FileSelector:
         self.config = config
         self.theme_manager = theme_manager
         self.spec = self.config.get_ignore_spec()
-        self.items: List[Tuple[Path, bool]] = []  # (path, is_dir)
+        self.items: List[Tuple[Path, bool, int]] = []  # (path, is_dir, 들여쓰기 깊이)
+        # 루트는 한 번만 resolve. 하위 항목은 _scan_dir이 돌려준 (이미 실제) 경로를 그대로 사용합니다.
+        self._base_dir = self.config.BASE_DIR.resolve()
         self.selected: set[Path] = set()
         self.expanded: set[Path] = set()
+        # 폴더 → 하위 전체 파일 집합. 화면 갱신마다 보이는 폴더 수만큼 디스크를 다시 훑지 않도록
+        # TUI 세션 동안 캐시합니다 (start()에서 초기화).
+        self._subtree_files: Dict[Path, FrozenSet[Path]] = {}
+        # (scandir 경로 문자열, 디렉터리 여부) → 정규화된 Path (무시 대상이면 None).
+        # 다시 훑을 때 같은 Path 객체를 재사용해 items/selected/expanded가 객체를 공유하고
+        # (해시도 객체당 한 번만 계산), Path 생성·무시 규칙 검사를 반복하지 않습니다.
+        self._path_pool: Dict[Tuple[str, bool], Optional[Path]] = {}
+
+    def _scan_dir(self, folder: Path) -> List[Tuple[Path, bool]]:
+        """
+        folder 바로 아래의 (경로, 디렉터리 여부) 목록을 (디렉터리 우선, 이름순)으로 반환합니다.
+        무시 대상과 디렉터리/일반 파일이 아닌 항목은 제외합니다.
+        os.scandir의 DirEntry 타입 정보를 재사용하므로 항목마다 stat/resolve 하지 않습니다
+        (심볼릭 링크만 실제 경로로 resolve).
+        """
+        entries: List[Tuple[bool, str, Path]] = []
+        with os.scandir(folder) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                    if not is_dir and not entry.is_file():
+                        continue
+                    key = (entry.path, is_dir)
+                    if key in self._path_pool:
+                        path = self._path_pool[key]
+                    else:
+                        path = Path(entry.path)
+                        if self.config.is_ignored(path, self.spec, is_dir=is_dir):
+                            path = None
+                        elif entry.is_symlink():
+                            path = path.resolve()
+                        self._path_pool[key] = path
+                except OSError:
+                    continue
+                if path is None:
+                    continue
+                entries.append((not is_dir, entry.name, path))
+        entries.sort(key=lambda e: (e[0], e[1]))
+        return [(path, not is_file) for is_file, _, path in entries]
 
     def refresh(self) -> None:
         self.items.clear()
+        # 깊이는 순회하면서 함께 기록해 두고, 위젯을 만들 때마다 relative_to로 다시 계산하지 않습니다.
+        # (폴더는 자신의 깊이, 파일은 부모 폴더의 깊이 + 체크박스 앞 여백으로 정렬)
         def visit_dir(path: Path, depth: int):
-            path = path.resolve()
-            # [변경] 전역 is_ignored 대신 self.config.is_ignored 사용
-            if depth > 0 and self.config.is_ignored(path, self.spec):
-                return
-            
-            self.items.append((path, True))
-            
+            self.items.append((path, True, depth))
+
             if path in self.expanded:
                 try:
-                    children = sorted(path.iterdir(), key=lambda p: (not p.is_dir(), p.name))
-                    for child in children:
-                        if child.is_dir():
+                    for child, is_dir in self._scan_dir(path):
+                        if is_dir:
                             visit_dir(child, depth + 1)
-                        elif child.is_file():
-                            # [변경] 전역 is_ignored 대신 self.config.is_ignored 사용
-                            if self.config.is_ignored(child, self.spec):
-                                continue
+                        else:
                             # 확장자/휴리스틱 필터 제거, ignore만 통과하면 추가
-                            #if child.suffix.lower() in (*constants.PLAIN_EXTS, *constants.IMG_EXTS, constants.PDF_EXT):
-                            self.items.append((child.resolve(), False))
+                            #if child.suffix.lower() in constants.ALLOWED_EXTS:
+                            self.items.append((child, False, depth))
                 except Exception:
                     pass
 
-        # [변경] 전역 BASE_DIR 대신 self.config.BASE_DIR 사용
-        visit_dir(self.config.BASE_DIR, 0)
+        visit_dir(self._base_dir, 0)
     
-    def get_all_files_in_dir(self, folder: Path) -> set[Path]:                                       
-        """주어진 폴더 내 모든 하위 파일을 무시 규칙을 적용하여 반환합니다."""
-        result = set()
-        if self.config.is_ignored(folder, self.spec):
-            return result
-        try:
-            for entry in folder.iterdir():                                                           
-                if self.config.is_ignored(entry, self.spec):
-                    continue
-                if entry.is_dir():                                                                   
-                    result.update(self.get_all_files_in_dir(entry))                                       
-                elif entry.is_file():                                                                
-                    #if entry.suffix.lower() in (*constants.PLAIN_EXTS, *constants.IMG_EXTS, constants.PDF_EXT):                    
-                    result.add(entry.resolve())
-        except Exception:                                                                            
-            pass                                                                                     
-        return result
+    def get_all_files_in_dir(self, folder: Path) -> FrozenSet[Path]:
+        """
+        주어진 폴더 내 모든 하위 파일을 무시 규칙을 적용하여 반환합니다.
+        결과는 폴더별로 캐시되며, 한 번 훑을 때 하위 폴더들의 결과도 함께 채워집니다.
+        """
+        cached = self._subtree_files.get(folder)
+        if cached is not None:
+            return cached
+
+        result: Set[Path] = set()
+        if not self.config.is_ignored(folder, self.spec):
+            try:
+                for child, is_dir in self._scan_dir(folder):
+                    if is_dir:
+                        result.update(self.get_all_files_in_dir(child))
+                    else:
+                        #if child.suffix.lower() in constants.ALLOWED_EXTS:
+                        result.add(child)
+            except Exception:
+                pass
+        files = frozenset(result)
+        self._subtree_files[folder] = files
+        return files
     
     def folder_all_selected(self, folder: Path) -> bool:                                             
         """해당 폴더의 모든 허용 파일이 선택되었는지 확인합니다."""
@@ -79,15 +119,12 @@ class FileSelector:
     # TUI
     def start(self) -> List[str]:
         """TUI를 시작하고 사용자가 선택한 파일 경로 목록을 반환합니다."""
+        self._subtree_files.clear()
+        self._path_pool.clear()
         self.refresh()
 
-        def mkwidget(data: Tuple[Path, bool]) -> urwid.Widget:                                           
-            path, is_dir = data                                                                          
-            try:
-                relative_path = path.relative_to(self.config.BASE_DIR)
-                depth = len(relative_path.parts) - (0 if is_dir or path == self.config.BASE_DIR else 1)
-            except ValueError:
-                depth = 0 # BASE_DIR 외부에 있는 경우
+        def mkwidget(data: Tuple[Path, bool, int]) -> urwid.Widget:                                           
+            path, is_dir, depth = data                                                                          
             indent = "  " * depth                                                                        
                                                                                                         
             # 선택 상태 결정: 부분선택(폴더) 고려                                                        
@@ -110,6 +147,22 @@ class FileSelector:
         def refresh_list() -> None:
             walker[:] = [mkwidget(i) for i in self.items]
 
+        def refresh_rows(changed: AbstractSet[Path]) -> None:
+            """
+            선택 상태가 바뀐 파일(changed)의 영향을 받는 행만 다시 만듭니다.
+            (해당 파일 행 + 그 파일을 하위에 포함하는 폴더 행. 폴더 하위 파일 집합은 캐시되어 있음)
+            """
+            if not changed:
+                return
+            for i, item in enumerate(self.items):
+                path, is_dir = item[0], item[1]
+                if is_dir:
+                    affected = not changed.isdisjoint(self.get_all_files_in_dir(path))
+                else:
+                    affected = path in changed
+                if affected:
+                    walker[i] = mkwidget(item)
+
         def keypress(key: str) -> None:
             if isinstance(key, tuple) and len(key) >= 4:
                 event_type, button, col, row = key[:4]
@@ -128,24 +181,26 @@ class FileSelector:
             
             idx = listbox.focus_position
             if key == " ":
-                tgt, is_dir = self.items[idx]
-                tgt = tgt.resolve()
+                tgt, is_dir, _ = self.items[idx]
                 if is_dir:
                     files_in_dir = self.get_all_files_in_dir(tgt)
                     if files_in_dir.issubset(self.selected):                                                 
                         # 이미 전체 선택되어 있었으니 전체 해제                                              
+                        changed = files_in_dir
                         self.selected -= files_in_dir                                                        
                         self.selected.discard(tgt)                                                           
                     else:                                                                                    
                         # 전체 선택 아님, 모두 추가                                                          
+                        changed = files_in_dir - self.selected
                         self.selected |= files_in_dir                                                        
                         self.selected.add(tgt)
                 else:
-                    self.selected.symmetric_difference_update({tgt})
-                refresh_list()
+                    changed = {tgt}
+                    self.selected.symmetric_difference_update(changed)
+                # 구조는 그대로이므로 전체 재구성 대신 체크 표시가 바뀌는 행만 교체
+                refresh_rows(changed)
             elif key == "enter":
-                tgt, is_dir = self.items[idx]
-                tgt = tgt.resolve()
+                tgt, is_dir, _ = self.items[idx]
                 if is_dir:
                     if tgt in self.expanded:
                         self.expanded.remove(tgt)
@@ -155,7 +210,7 @@ class FileSelector:
                     refresh_list()
             elif key.lower() == "a":
                 # 전체 트리에서 모든 파일(노출 여부와 관계 없이!)을 재귀 선택
-                self.selected = self.get_all_files_in_dir(self.config.BASE_DIR)
+                self.selected = set(self.get_all_files_in_dir(self._base_dir))
                 refresh_list()
             elif key.lower() == "n":
                 self.selected.clear()
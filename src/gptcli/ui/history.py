@@ -0,0 +1,38 @@
+# src/gptcli/ui/history.py
+from __future__ import annotations
+import atexit
+import datetime
+from pathlib import Path
+from typing import IO, Optional, Union
+from prompt_toolkit.history import FileHistory
+
+
+class BufferedFileHistory(FileHistory):
+    """
+    프롬프트 입력마다 파일을 open/write/close 하던 FileHistory를 대체합니다.
+    처음 기록할 때 연 파일 핸들(바이너리 추가 모드, 버퍼 없음)을 세션 내내 재사용하고,
+    항목마다 write 한 번으로 바로 디스크에 씁니다. 종료(/exit, Ctrl+C) 시 close()는 핸들만 닫습니다.
+    파일 포맷은 FileHistory와 동일하므로 기존 히스토리 파일과 호환됩니다.
+    """
+    def __init__(self, filename: Union[str, Path]):
+        super().__init__(filename)
+        self._fh: Optional[IO[bytes]] = None
+        # /exit 경로를 거치지 않고 끝나도 핸들을 닫음 (버퍼가 없으므로 기록할 내용은 남지 않음)
+        atexit.register(self.close)
+
+    def _handle(self) -> IO[bytes]:
+        if self._fh is None or self._fh.closed:
+            # FileHistory처럼 "ab"로 열어 플랫폼과 관계없이 '\n'만 기록 (텍스트 모드는 Windows에서 '\r\n')
+            self._fh = open(self.filename, "ab", buffering=0)
+        return self._fh
+
+    def store_string(self, string: str) -> None:
+        # 한 항목을 하나의 write로 합쳐서 기록
+        lines = "".join(f"+{line}\n" for line in string.split("\n"))
+        self._handle().write(f"\n# {datetime.datetime.now()}\n{lines}".encode("utf-8"))
+
+    def close(self) -> None:
+        """파일 핸들을 닫습니다. 여러 번 호출해도 안전합니다."""
+        if self._fh is not None and not self._fh.closed:
+            self._fh.close()
+        self._fh = None
@@ -1,79 +1,170 @@
 from __future__ import annotations
-import json, base64, io, os, re, mimetypes
+import json, base64, io, mmap, os, re, mimetypes, difflib, hashlib
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 from rich.console import Console
-from PIL import Image
 import src.constants as constants
 
+try:  # 선택 의존성: 있으면 C 확장 JSON 사용, 없으면 표준 json
+    import orjson
+except ImportError:
+    orjson = None
+
+try:  # 선택 의존성: 있으면 SIMD 가속 base64 사용, 없으면 표준 base64
+    import pybase64
+except ImportError:
+    pybase64 = None
+
+try:  # 선택 의존성: 있으면 C 구현 SequenceMatcher 사용 (결과는 difflib과 동일)
+    from cdifflib import CSequenceMatcher as _SequenceMatcher
+except ImportError:
+    _SequenceMatcher = difflib.SequenceMatcher
+
 class Utils:
     """
     특정 클래스에 속하지 않는 순수 유틸리티 함수들을 모아놓은 정적 클래스.
     모든 메서드는 의존성을 인자로 주입받습니다.
     """
     _VENDOR_SPECIFIC_OFFSET = constants.VENDOR_SPECIFIC_OFFSET
+    # 이 크기 이상인 텍스트 첨부는 mmap 버퍼에서 바로 디코딩 (bytes 사본을 만들지 않음)
+    _MMAP_READ_THRESHOLD = 1024 * 1024
+    # 모드별 시스템 프롬프트 (strip을 매 턴 반복하지 않도록 로드 시 1회 정리)
+    _SYSTEM_PROMPTS: Dict[str, str] = {mode: text.strip() for mode, text in constants.PROMPT_TEMPLATES.items()}
 
     @staticmethod
     def _load_json(path: Path, default: Any = None) -> Any:
         """JSON 파일을 안전하게 읽어옵니다. 실패 시 기본값을 반환합니다."""
         if path.exists():
             try:
-                return json.loads(path.read_text(encoding="utf-8"))
+                return Utils._json_loads(path.read_bytes())
             except (json.JSONDecodeError, IOError):
                 return default or {}
         return default or {}
     
     @staticmethod
     def _save_json(path: Path, data: Any) -> bool:
-        """JSON 데이터를 파일에 안전하게 저장합니다."""
+        """
+        JSON 데이터를 파일에 안전하게 저장합니다.
+        임시 파일에 먼저 쓰고 os.replace로 교체하므로, 쓰는 도중 중단되어도 기존 파일이 깨지지 않습니다.
+        """
+        payload = Utils._json_dumps(data, indent=True)
+        tmp = path.with_name(path.name + ".tmp")
         try:
-            path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+            try:
+                tmp.write_bytes(payload)
+            except FileNotFoundError:
+                # 매 저장마다 mkdir하지 않고, 상위 디렉터리가 없을 때만 생성 후 재시도
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_bytes(payload)
+            os.replace(tmp, path)
             return True
         except IOError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
             return False
 
+    @staticmethod
+    def _json_loads(data: str | bytes) -> Any:
+        """
+        JSON 문자열/바이트를 파싱합니다. orjson이 설치되어 있으면 사용합니다.
+        orjson.JSONDecodeError는 json.JSONDecodeError의 하위 클래스이므로
+        호출부의 예외 처리는 그대로 유지됩니다.
+        """
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+    @staticmethod
+    def _json_dumps(data: Any, indent: bool = False) -> bytes:
+        """
+        데이터를 UTF-8 JSON 바이트로 직렬화합니다 (ensure_ascii=False와 동일한 출력).
+        orjson이 처리하지 못하는 값(64비트 초과 정수 등)은 표준 json으로 되돌아갑니다.
+        """
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+            try:
+                return orjson.dumps(data, option=option)
+            except TypeError:
+                pass
+        return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
     @staticmethod
     def _read_plain_file(path: Path) -> str:
+        """
+        텍스트 파일을 UTF-8로 읽습니다 (깨진 바이트는 무시, 줄바꿈은 '\n'으로 통일).
+        큰 파일은 read_text처럼 bytes 전체를 한 번 더 만들지 않도록 mmap에서 바로 디코딩합니다.
+        """
         try:
-            return path.read_text(encoding="utf-8", errors="ignore")
+            with path.open("rb") as f:
+                if os.fstat(f.fileno()).st_size < Utils._MMAP_READ_THRESHOLD:
+                    return path.read_text(encoding="utf-8", errors="ignore")
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    text = str(mm, "utf-8", "ignore")
+            if "\r" in text:
+                # read_text(universal newlines)와 같은 결과를 유지
+                text = text.replace("\r\n", "\n").replace("\r", "\n")
+            return text
         except Exception as e:
             return f"[파일 읽기 실패: {e}]"
 
     @staticmethod
     def _encode_base64(path: Path) -> str:
-        return base64.b64encode(path.read_bytes()).decode("utf-8")
+        """
+        파일을 base64 문자열로 인코딩합니다. pybase64가 설치되어 있으면 사용합니다.
+        큰 파일(PDF 등)은 read_bytes 사본 없이 mmap 버퍼를 바로 인코딩합니다.
+        """
+        b64encode = pybase64.b64encode if pybase64 is not None else base64.b64encode
+        with path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size < Utils._MMAP_READ_THRESHOLD:
+                return b64encode(f.read()).decode("ascii")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return b64encode(mm).decode("ascii")
+
+    # 확장자(소문자) -> 이미지 MIME 타입 캐시
+    _IMAGE_MIME_CACHE: Dict[str, str] = {}
+
+    @staticmethod
+    def _image_mime_type(path: Path) -> str:
+        """이미지 MIME 타입을 확장자 단위로 캐시해 반환합니다 (알 수 없으면 image/jpeg)."""
+        suffix = path.suffix.lower()
+        mime = Utils._IMAGE_MIME_CACHE.get(suffix)
+        if mime is None:
+            mime = mimetypes.guess_type(path)[0] or "image/jpeg"
+            Utils._IMAGE_MIME_CACHE[suffix] = mime
+        return mime
 
     @staticmethod
     def get_system_prompt_content(mode: str) -> str:
-        return constants.PROMPT_TEMPLATES.get(mode,constants.PROMPT_TEMPLATES["dev"]).strip()
+        return Utils._SYSTEM_PROMPTS.get(mode, Utils._SYSTEM_PROMPTS["dev"])
 
     @staticmethod
+    def build_response_cache_key(model: str, system_prompt: str, messages: List[Dict[str, Any]]) -> str:
+        """
+        (모델, 시스템 프롬프트, 전송 메시지) 전체 상태로 응답 캐시 키를 만듭니다.
+        시스템 프롬프트에 모드가 반영되므로 모드가 바뀌면 키도 달라집니다.
+        """
+        payload = json.dumps([model, system_prompt, messages], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
     def _parse_backticks(line: str) -> Optional[tuple[int, str]]:
         """
         주어진 라인이 코드 블록 구분자인지 확인하고, 백틱 개수와 언어 태그를 반환합니다.
+        결과는 입력 문자열에만 의존하므로 캐시합니다 (같은 닫힘 펜스/언어 펜스가 반복해서 나옴).
         """
         stripped_line = line.strip()
-        if not stripped_line.startswith('`'):
-            return None
-
-        count = 0
-        for char in stripped_line:
-            if char == '`':
-                count += 1
-            else:
-                break
+        # 선행 백틱 개수는 lstrip(C 구현)으로 한 번에 셉니다 (백틱으로 시작하지 않으면 0).
+        count = len(stripped_line) - len(stripped_line.lstrip('`'))
 
         # 최소 3개 이상이어야 유효한 구분자로 간주
         if count < 3:
             return None
 
-        # 구분자 뒤에 다른 문자가 있다면 백틱이 아니므로 유효하지 않음
-        if len(stripped_line) > count and stripped_line[count] == '`':
-            return None
-
-        language = stripped_line[count:].strip()
-        return count, language
+        return count, stripped_line[count:].strip()
 
     @staticmethod
     def optimize_image_for_api(path: Path, console: Console, max_dimension: int = 1024, quality: int = 85) -> str:
@@ -84,7 +175,13 @@ class Utils:
         - base64 인코딩
         """
         try:
+            from PIL import Image
             with Image.open(path) as img:
+                # JPEG는 디코드 단계에서 1/2~1/8 배율로 줄여 읽음 (원본 해상도 RGB 버퍼를 만들지 않음).
+                # thumbnail의 reducing_gap(2.0)과 같은 여유를 두므로 최종 화질은 동일
+                if img.format == 'JPEG' and max(img.size) > max_dimension:
+                    img.draft('RGB', (max_dimension * 2, max_dimension * 2))
+
                 # EXIF 회전 정보 적용
                 img = img.convert('RGB')
                 
@@ -104,9 +201,13 @@ class Utils:
             return Utils._encode_base64(path)
 
     @staticmethod
-    def prepare_content_part(path: Path, console: Console, token_estimator: 'TokenEstimator', optimize_images: bool = True) -> Dict[str, Any]:
-        """파일을 API 요청용 컨텐츠로 변환"""
-        if path.suffix.lower() in constants.IMG_EXTS:
+    def prepare_content_part(path: Path, console: Console, token_estimator: 'TokenEstimator', optimize_images: bool = True, report_text_tokens: bool = True) -> Dict[str, Any]:
+        """
+        파일을 API 요청용 컨텐츠로 변환
+        report_text_tokens=False면 텍스트 파일의 토큰 계산/출력을 생략합니다 (여러 파일을 한 번에 보낼 때).
+        """
+        ext = path.suffix.lower()
+        if ext in constants.IMG_EXTS:
             # 이미지 크기 확인
             file_size_mb = path.stat().st_size / (1024 * 1024)
             
@@ -129,7 +230,7 @@ class Utils:
             if estimated_tokens > 10000:
                 console.print(f"[yellow]경고: {path.name}이 약 {estimated_tokens:,} 토큰을 사용합니다.[/yellow]")
             
-            data_url = f"data:{mimetypes.guess_type(path)[0] or 'image/jpeg'};base64,{base64_data}"
+            data_url = f"data:{Utils._image_mime_type(path)};base64,{base64_data}"
             return {
                 "type": "image_url",
                 "image_url": {
@@ -139,7 +240,7 @@ class Utils:
                 }
             }
         
-        elif path.suffix.lower() == constants.PDF_EXT:
+        elif ext == constants.PDF_EXT:
             estimated_tokens = token_estimator.estimate_pdf_tokens(path)
             console.print(f"[dim]PDF 토큰: 약 {estimated_tokens:,}개[/dim]")
 
@@ -152,13 +253,26 @@ class Utils:
         
         # 텍스트 파일
         text = Utils._read_plain_file(path)
-        tokens = token_estimator.count_text_tokens(text)
-        console.print(f"[dim]텍스트 토큰: {tokens:,}개[/dim]", highlight=False)
+        if report_text_tokens:
+            tokens = token_estimator.count_text_tokens(text)
+            console.print(f"[dim]텍스트 토큰: {tokens:,}개[/dim]", highlight=False)
         return {
             "type": "text",
             "text": f"\n\n[파일: {path}]\n```\n{text}\n```",
         }
 
+    @staticmethod
+    def _iter_message_texts(messages: Sequence[Dict[str, Any]]) -> Iterator[str]:
+        """메시지 목록에서 토큰화 대상 텍스트(문자열 content, text 파트)만 순서대로 꺼냅니다."""
+        for msg in messages:
+            content = msg.get("content", "")
+            if isinstance(content, str):
+                yield content
+            elif isinstance(content, list):
+                for part in content:
+                    if part.get("type") == "text":
+                        yield part.get("text", "")
+
     @staticmethod
     def _count_message_tokens_with_estimator(msg: Dict[str, Any], te: 'TokenEstimator') -> int:
         """
@@ -174,7 +288,6 @@ class Utils:
         tool_calls = msg.get("tool_calls")
         if tool_calls:
             # tool_calls JSON 직렬화 크기 기반 추정
-            import json
             tool_calls_json = json.dumps(tool_calls, ensure_ascii=False)
             total += len(tool_calls_json) // 3  # 3글자 ≈ 1토큰
 
@@ -308,24 +421,25 @@ class Utils:
                 highlight=False
             )
 
-        # 메시지별 토큰 산출
-        per_message = []
+        # 최신 메시지부터 토큰을 세며 예산을 채움.
+        # 예산을 넘는 지점에서 멈추므로, 어차피 잘려 나갈 오래된 메시지는 토큰화하지 않습니다.
+        # 남길 구간의 시작 위치만 기록해 두고 마지막에 한 번 슬라이스 (append + reverse 없음)
+        cut = len(regular_messages)
+        used = 0
         total_estimated = 0
-        for i, m in enumerate(regular_messages):
-            t = Utils._count_message_tokens_with_estimator(m, te)
-            per_message.append((m, t))
+        overflowed = False
+        for i in range(len(regular_messages) - 1, -1, -1):
+            t = Utils._count_message_tokens_with_estimator(regular_messages[i], te)
             total_estimated += t
-
-        console.print(f"[cyan]📊 총 추정: {total_estimated:,}tk / 예산: {effective_budget:,}tk[/cyan]", highlight=False)
-
-        trimmed: List[Dict[str, Any]] = []
-        used = 0
-        for m, t in reversed(per_message):
             if used + t > effective_budget:
+                overflowed = True
                 break
-            trimmed.append(m)
             used += t
-        trimmed.reverse()
+            cut = i
+        trimmed = regular_messages[cut:]
+
+        estimated_str = f"{total_estimated:,}tk 이상" if overflowed else f"{total_estimated:,}tk"
+        console.print(f"[cyan]📊 총 추정: {estimated_str} / 예산: {effective_budget:,}tk[/cyan]", highlight=False)
 
         if not trimmed and regular_messages:
             last = regular_messages[-1]
@@ -372,17 +486,22 @@ class Utils:
         State-machine 기반으로 마크다운에서 코드 블록을 추출합니다.
         ask_stream의 실시간 파싱 로직과 동일한 원리로, 정규식보다 안정적입니다.
         """
-        blocks = []
-        lines = markdown.split('\n')
-        
+        blocks: List[Tuple[str, str]] = []
+
         in_code_block = False
         outer_delimiter_len = 0
         nesting_depth = 0
-        code_buffer: List[str] = []
+        body_start = 0  # 현재 코드 블록 본문이 시작되는 오프셋
         language = ""
-        
-        for line in lines:
-            delimiter_info = Utils._parse_backticks(line)
+
+        # 줄 리스트를 만들지 않고 오프셋으로 한 번만 훑으며, 블록 본문은 원문에서 바로 잘라냅니다.
+        pos = 0
+        size = len(markdown)
+        while pos <= size:
+            nl = markdown.find('\n', pos)
+            line_end = size if nl == -1 else nl
+            line = markdown[pos:line_end]
+            delimiter_info = Utils._parse_backticks(line) if '```' in line else None
 
             # 코드 블록 시작 
             if not in_code_block:
@@ -390,8 +509,8 @@ class Utils:
                     in_code_block = True
                     outer_delimiter_len, language = delimiter_info
                     nesting_depth = 0
-                    code_buffer = []
-                
+                    body_start = line_end + 1
+
             # 코드 블록 종료 
             else:
                 is_matching_delimiter = delimiter_info and delimiter_info[0] == outer_delimiter_len
@@ -404,28 +523,99 @@ class Utils:
                         nesting_depth -= 1
 
                 if nesting_depth < 0:
-                    # 최종 블록 종료
-                    blocks.append((language, "\n".join(code_buffer)))
+                    # 최종 블록 종료 (본문 마지막 줄의 개행은 제외)
+                    blocks.append((language, markdown[body_start:max(body_start, pos - 1)]))
                     in_code_block = False
-                else:
-                    code_buffer.append(line)
+
+            if nl == -1:
+                break
+            pos = nl + 1
 
         # 파일 끝까지 코드 블록이 닫히지 않은 엣지 케이스 처리
-        if in_code_block and code_buffer:
-            blocks.append((language, "\n".join(code_buffer)))
+        if in_code_block and body_start <= size:
+            blocks.append((language, markdown[body_start:]))
             
         return blocks
     
+    @staticmethod
+    def _unified_range(start: int, stop: int) -> str:
+        """difflib의 unified 헝크 범위 표기 ('시작,길이', 길이 1이면 '시작')."""
+        beginning = start + 1
+        length = stop - start
+        if length == 1:
+            return f"{beginning}"
+        if not length:
+            beginning -= 1
+        return f"{beginning},{length}"
+
+    @staticmethod
+    def unified_diff_lines(
+        old_lines: Sequence[str],
+        new_lines: Sequence[str],
+        fromfile: str = "",
+        tofile: str = "",
+        n: int = 3,
+        lineterm: str = "",
+    ) -> List[str]:
+        """
+        difflib.unified_diff와 같은 형식의 diff를 반환하되, 앞뒤 공통 라인을 먼저 잘라내고
+        변경 구간(+문맥 n줄)에만 SequenceMatcher를 적용합니다.
+        큰 파일의 일부만 바뀐 일반적인 경우 O(N²) 비교 대상을 크게 줄여줍니다.
+        잘라낸 범위 안에서 매칭하므로 반복되는 줄이 있으면 헝크 경계가 difflib.unified_diff와
+        다를 수 있습니다. 결과는 같은 변경을 나타내는 유효한 패치이지만, 바이트 단위로 같다는 보장은 없습니다.
+        헝크는 get_grouped_opcodes에서 바로 만들며, cdifflib가 있으면 C 구현 매처를 사용합니다.
+
+        Note:
+            diff가 필요한 곳은 이 함수(또는 difflib.unified_diff)만 사용합니다.
+            difflib.ndiff / Differ.compare는 전체 버퍼에 대해 글자 단위 비교
+            (_fancy_replace)를 수행하므로 큰 입력에서 매우 느려 사용하지 않습니다.
+        """
+        len_old, len_new = len(old_lines), len(new_lines)
+        limit = min(len_old, len_new)
+
+        prefix = 0
+        while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while (suffix < limit - prefix
+               and old_lines[len_old - 1 - suffix] == new_lines[len_new - 1 - suffix]):
+            suffix += 1
+
+        # 문맥 n줄은 남겨야 헝크 경계가 원래 결과와 같아짐
+        skip_head = max(0, prefix - n)
+        skip_tail = max(0, suffix - n)
+        a = old_lines[skip_head:len_old - skip_tail]
+        b = new_lines[skip_head:len_new - skip_tail]
+
+        diff: List[str] = []
+        for group in _SequenceMatcher(None, a, b).get_grouped_opcodes(n):
+            if not diff:
+                diff.append(f"--- {fromfile}{lineterm}")
+                diff.append(f"+++ {tofile}{lineterm}")
+            # 잘라낸 앞부분(skip_head)만큼 헝크 헤더의 줄 번호를 보정
+            first, last = group[0], group[-1]
+            old_range = Utils._unified_range(first[1] + skip_head, last[2] + skip_head)
+            new_range = Utils._unified_range(first[3] + skip_head, last[4] + skip_head)
+            diff.append(f"@@ -{old_range} +{new_range} @@{lineterm}")
+            for tag, i1, i2, j1, j2 in group:
+                if tag == "equal":
+                    diff.extend([" " + line for line in a[i1:i2]])
+                    continue
+                if tag != "insert":
+                    diff.extend(["-" + line for line in a[i1:i2]])
+                if tag != "delete":
+                    diff.extend(["+" + line for line in b[j1:j2]])
+        return diff
+
     @staticmethod
     def convert_to_placeholder_message(msg: Dict) -> Dict:
         """
         메시지의 첨부파일을 플레이스홀더로 변환합니다.
         원본을 수정하지 않고 새로운 딕셔너리를 반환합니다.
         """
-        import copy
-        
-        # 깊은 복사로 원본 보호
-        new_msg = copy.deepcopy(msg)
+        # content는 아래에서 새 문자열로 교체만 하므로 얕은 복사로 충분합니다.
+        # (deepcopy는 매 턴 과거 첨부의 base64 데이터까지 전부 순회함)
+        new_msg = dict(msg)
         
         if isinstance(new_msg.get("content"), str):
             return new_msg
@@ -0,0 +1,27 @@
+# tests/test_ai_stream_markdown.py
+import io
+
+from rich.console import Console
+
+from src.gptcli.services.ai_stream import AIStreamParser
+
+
+def _render(text: str) -> str:
+    parser = AIStreamParser(Console(file=io.StringIO()))
+    return parser._simple_markdown_to_rich(text)
+
+
+def test_stray_backtick_does_not_pair_across_lines():
+    # 문단 단위 flush: 앞 줄의 짝 없는 백틱이 다음 줄 백틱과 짝지어지면 안 됨
+    out = _render("Use `x\n- item with `y` here\n")
+    assert out == "Use `x\n[bold blue]•[/bold blue] item with [bold white on #484f58] y [/] here\n"
+
+
+def test_bold_does_not_span_line_break():
+    out = _render("a **b\n- c** d\n")
+    assert out == "a **b\n[bold blue]•[/bold blue] c** d\n"
+
+
+def test_inline_code_and_bold_on_one_line():
+    out = _render("**bold** and `code`\n1. x\n")
+    assert out == "[bold]bold[/bold] and [bold white on #484f58] code [/]\n[yellow]1.[/yellow] x\n"
@@ -0,0 +1,125 @@
+# tests/test_config_sessions.py
+import json
+
+import src.constants as constants
+from src.gptcli.services.config import ConfigManager
+
+
+class _RecordingConsole:
+    def __init__(self):
+        self.lines = []
+
+    def print(self, text="", **kwargs):
+        self.lines.append(text)
+
+
+def _config(tmp_path, console=None):
+    return ConfigManager(base_dir=tmp_path, config_dir=tmp_path / "config", console=console)
+
+
+def _msgs(*contents):
+    return [{"role": "user" if i % 2 == 0 else "assistant", "content": c} for i, c in enumerate(contents)]
+
+
+def _write_journal(cfg, name, *records, tail=b""):
+    lines = b"".join(json.dumps(r, ensure_ascii=False).encode("utf-8") + b"\n" for r in records)
+    cfg.get_session_journal_path(name).write_bytes(lines + tail)
+
+
+def _record(base, messages, **extra):
+    return {"base": base, "messages": messages, "usage": None, "model": None,
+            "context_length": None, "mode": None, **extra}
+
+
+def test_replay_appends_turns_onto_snapshot(tmp_path):
+    cfg = _config(tmp_path)
+    cfg.save_session("s", _msgs("q1", "a1"), "m/x", 1000, [], mode="dev", summary_history=[])
+    cfg.append_session_turn("s", _msgs("q2", "a2"), base_count=2, usage={"total_tokens": 5}, model="m/y")
+    cfg.flush_writes()
+
+    data = _config(tmp_path).load_session("s")
+    assert [m["content"] for m in data["messages"]] == ["q1", "a1", "q2", "a2"]
+    assert data["usage_history"] == [{"total_tokens": 5}]
+    assert data["model"] == "m/y"
+    # 로드하면서 스냅샷으로 합치고 로그는 지움
+    assert not cfg.get_session_journal_path("s").exists()
+    snapshot = json.loads(cfg.get_session_path("s").read_text(encoding="utf-8"))
+    assert len(snapshot["messages"]) == 4
+
+
+def test_records_already_in_snapshot_are_skipped(tmp_path):
+    console = _RecordingConsole()
+    cfg = _config(tmp_path, console)
+    cfg.save_session("s", _msgs("q1", "a1", "q2", "a2"), "m/x", 1000, [], mode="dev", summary_history=[])
+    _write_journal(cfg, "s", _record(2, _msgs("q2", "a2")), _record(4, _msgs("q3", "a3")))
+
+    data = cfg.load_session("s")
+    assert [m["content"] for m in data["messages"]] == ["q1", "a1", "q2", "a2", "q3", "a3"]
+    assert console.lines == []
+
+
+def test_records_ahead_of_snapshot_are_reported_as_gaps(tmp_path):
+    console = _RecordingConsole()
+    cfg = _config(tmp_path, console)
+    cfg.save_session("s", _msgs("q1", "a1"), "m/x", 1000, [], mode="dev", summary_history=[])
+    _write_journal(cfg, "s", _record(4, _msgs("q3", "a3")))
+
+    data = cfg.load_session("s")
+    assert [m["content"] for m in data["messages"]] == ["q1", "a1"]
+    assert len(console.lines) == 1 and "1개" in console.lines[0]
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    cfg = _config(tmp_path)
+    cfg.save_session("s", _msgs("q1", "a1"), "m/x", 1000, [], mode="dev", summary_history=[])
+    _write_journal(cfg, "s", _record(2, _msgs("q2", "a2")), tail=b'{"base": 4, "messages": [{"role": "us')
+
+    data = cfg.load_session("s")
+    assert [m["content"] for m in data["messages"]] == ["q1", "a1", "q2", "a2"]
+
+
+def test_legacy_list_session_replays_journal(tmp_path):
+    cfg = _config(tmp_path)
+    cfg.get_session_path("s").write_text(json.dumps(_msgs("q1", "a1")), encoding="utf-8")
+    _write_journal(cfg, "s", _record(2, _msgs("q2", "a2")))
+
+    data = cfg.load_session("s")
+    assert [m["content"] for m in data["messages"]] == ["q1", "a1", "q2", "a2"]
+    assert data["mode"] == "dev"
+    # 합치면서 현재 형식(dict)으로 다시 저장됨
+    snapshot = json.loads(cfg.get_session_path("s").read_text(encoding="utf-8"))
+    assert isinstance(snapshot, dict) and len(snapshot["messages"]) == 4
+
+
+def test_mode_only_record_updates_mode(tmp_path):
+    cfg = _config(tmp_path)
+    cfg.save_session("s", _msgs("q1", "a1"), "m/x", 1000, [], mode="dev", summary_history=[])
+    # /mode 명령은 메시지 없이 모드만 담은 기록을 남김
+    cfg.append_session_turn("s", [], base_count=2, model="m/x", context_length=1000, mode="general")
+    cfg.flush_writes()
+
+    data = _config(tmp_path).load_session("s")
+    assert data["mode"] == "general"
+    assert [m["content"] for m in data["messages"]] == ["q1", "a1"]
+
+
+def test_compaction_at_threshold_removes_journal(tmp_path):
+    cfg = _config(tmp_path)
+    msgs = _msgs("q0", "a0")
+    cfg.save_session("s", msgs, "m/x", 1000, [], mode="dev", summary_history=[])
+
+    sizes = []
+    for i in range(1, constants.SESSION_JOURNAL_COMPACT_TURNS + 1):
+        turn = _msgs(f"q{i}", f"a{i}")
+        sizes.append(cfg.append_session_turn("s", turn, base_count=len(msgs)))
+        msgs = msgs + turn
+    assert sizes[-2] < constants.SESSION_JOURNAL_COMPACT_TURNS <= sizes[-1]
+
+    cfg.flush_writes()
+    assert cfg.get_session_journal_path("s").exists()
+    # 호출자(GPTCLI)는 임계값에 도달하면 전체 저장으로 합침
+    cfg.save_session("s", msgs, "m/x", 1000, [], mode="dev")
+    assert not cfg.get_session_journal_path("s").exists()
+
+    data = _config(tmp_path).load_session("s")
+    assert len(data["messages"]) == 2 * (constants.SESSION_JOURNAL_COMPACT_TURNS + 1)